@@ -4,7 +4,6 @@ import webbrowser
 import pyttsx3
 from datetime import datetime
 from groq import Groq
-from googlesearch import search
 from . import config
 import threading
 
@@ -268,7 +267,28 @@ class GroqWhisperService:
 
         #print(f'\n\n------------MESSAGES: {self.messages}')
 
+    def RestoreAssistantMessage(self, message):
+        """
+        Add an assistant message from a saved chat to the conversation, without calling the API
+        
+        Args:
+            message: The restored assistant response
+        """
+        if not message:
+            return
+            
+        self.messages.append({
+            "role": "assistant",
+            "content": message
+        })
+
     def WebSearch(self, query: str):
+        # googlesearch is an optional extra ("web"), so only import it when a search is requested
+        try:
+            from googlesearch import search
+        except ImportError:
+            print("googlesearch-python is not installed. Install it with: pip install googlesearch-python")
+            return
         print(f"Searching the web for: \033[92m{query}\033[0m")
         results = search(query, num_results=3)    
         for i, result in enumerate(results):
@@ -17,6 +17,19 @@ except ImportError:
 
 logger = logging.getLogger('KeyboardService')
 
+# pynput modifier key -> normalized name ('ctrl', 'alt', 'shift', 'cmd'), built once at import
+if pynput_keyboard is not None:
+    _Key = pynput_keyboard.Key
+    MODIFIER_KEYS = {
+        **dict.fromkeys((_Key.ctrl_l, _Key.ctrl_r), 'ctrl'),
+        **dict.fromkeys((_Key.alt_l, _Key.alt_r, _Key.alt_gr), 'alt'),
+        **dict.fromkeys((_Key.shift_l, _Key.shift_r), 'shift'),
+        # Treat cmd and windows key as 'cmd'
+        **dict.fromkeys((_Key.cmd_l, _Key.cmd_r, _Key.cmd), 'cmd'),
+    }
+else:
+    MODIFIER_KEYS = {}
+
 class KeyboardService(QObject):
     """
     Service for handling global keyboard shortcuts using pynput.Listener.
@@ -41,6 +54,7 @@ class KeyboardService(QObject):
         self._listener_thread = None
         self._listener_stop_event = threading.Event()
         self._pynput_listener = None # Holds the pynput listener instance
+        self._capture_callback = None # While set, the next non-modifier key is passed here instead of matched
 
         if pynput_keyboard is None:
             self.keyboard_error.emit("pynput library not found. Shortcuts disabled.")
@@ -151,6 +165,36 @@ class KeyboardService(QObject):
         self._pynput_listener = None # Allow garbage collection
 
 
+    def is_listening(self):
+        """Return True if the pynput listener thread is running."""
+        return self._listener_thread is not None and self._listener_thread.is_alive()
+
+
+    def capture_next_key(self, callback):
+        """
+        Route the next non-modifier key press to a callback instead of the registered shortcuts.
+
+        The running listener is reused, so recording a shortcut doesn't reinstall the
+        OS keyboard hook.
+
+        Args:
+            callback (function): Called on the listener thread with (key, modifiers), where
+                                 modifiers is the set of normalized modifiers held down.
+
+        Returns:
+            bool: False if the listener is not running, so nothing will be captured.
+        """
+        if not self.is_listening():
+            return False
+        self._capture_callback = callback
+        return True
+
+
+    def cancel_capture(self):
+        """Stop routing key presses to the capture callback."""
+        self._capture_callback = None
+
+
     def _listener_run(self):
         """Target method for the listener thread."""
         logger.info("pynput listener thread running...")
@@ -180,12 +224,7 @@ class KeyboardService(QObject):
 
     def _normalize_modifier(self, key):
          """Convert pynput modifier key object to simple string ('ctrl', 'alt', 'shift', 'cmd')."""
-         if key in (pynput_keyboard.Key.ctrl_l, pynput_keyboard.Key.ctrl_r): return 'ctrl'
-         if key in (pynput_keyboard.Key.alt_l, pynput_keyboard.Key.alt_r, pynput_keyboard.Key.alt_gr): return 'alt'
-         if key in (pynput_keyboard.Key.shift_l, pynput_keyboard.Key.shift_r): return 'shift'
-         # Treat cmd and windows key as 'cmd'
-         if key in (pynput_keyboard.Key.cmd_l, pynput_keyboard.Key.cmd_r, pynput_keyboard.Key.cmd): return 'cmd'
-         return None
+         return MODIFIER_KEYS.get(key)
 
 
     def _on_press(self, key):
@@ -200,11 +239,15 @@ class KeyboardService(QObject):
             self.current_pressed_modifiers.add(normalized_mod)
             return # Don't check non-modifier logic
 
+        # While a shortcut is being recorded, hand the key over instead of matching it
+        capture_callback = self._capture_callback
+        if capture_callback is not None:
+            self._capture_callback = None
+            capture_callback(key, set(self.current_pressed_modifiers))
+            return not self._listener_stop_event.is_set()
+
         # Non-modifier key pressed, check against registered shortcuts
-        try:
-            current_vk = getattr(key, 'vk', None)
-        except Exception:
-             current_vk = None
+        current_vk = getattr(key, 'vk', None)
 
         for action_name, shortcut_data in self.shortcuts.items():
             if not shortcut_data: continue
@@ -1,20 +1,16 @@
 import sys
 import os
 import logging
-import time
 import json
-import platform
 import pygame
-import wave
 import pyperclip
 from datetime import datetime
-from functools import partial
+from collections import OrderedDict
 from PyQt6.QtWidgets import (QApplication, QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                            QTextEdit, QLabel, QComboBox, QSplitter, QGroupBox, QGridLayout, QScrollArea,
-                            QListWidget, QListWidgetItem, QDialog, QSizePolicy)
-from PyQt6.QtCore import (Qt, QThread, pyqtSignal, pyqtSlot, QMetaObject, QTimer, QPoint, 
-                          QSettings, QSize)
-from PyQt6.QtGui import (QColor, QTextCursor, QFont, QIcon, QPalette, QAction, QPixmap)
+                            QPlainTextEdit, QLabel, QComboBox, QSplitter, QGroupBox, QGridLayout,
+                            QListWidget, QListWidgetItem, QDialog)
+from PyQt6.QtCore import Qt, pyqtSignal, pyqtSlot, QTimer, QThread, QThreadPool
+from PyQt6.QtGui import QFont, QIcon
 
 # Import UI components
 from ..ui.theme import ThemeManager
@@ -23,6 +19,8 @@ from ..ui.settings_dialog import SettingsDialog
 
 # Import audio components
 from ..audio.worker import AudioProcessingWorker
+from .workers import (ChatHistoryWriter, MicrophoneSwitchRunnable, RetranscribeRunnable,
+                      decode_chat_history)
 
 # Import services
 from .. import VoskService
@@ -44,18 +42,30 @@ except ImportError:
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
 logger = logging.getLogger('VoiceCommander')
 
+# Total size of the decoded sounds kept around for replaying chat items. Sounds are
+# held as uncompressed PCM at the mixer's format (about 10 MB per minute at 44.1 kHz
+# 16-bit stereo), so this trades roughly 64 MB of memory for instant replays
+SOUND_CACHE_BYTES = 64 * 1024 * 1024
+
+def decoded_sound_size(sound):
+    """Approximate size in bytes of a decoded pygame Sound, without copying its samples"""
+    frequency, sample_format, channels = pygame.mixer.get_init()
+    return int(sound.get_length() * frequency) * channels * (abs(sample_format) // 8)
+
 class VoiceCommanderApp(QMainWindow):
     """
     Main application window for Voice Commander
     """
     # Define some signals
     clear_chat_signal = pyqtSignal()  # Signal to clear chat from any thread
+    new_chat_signal = pyqtSignal()  # Signal to start a new chat from any thread
+    log_status_signal = pyqtSignal(str)  # Signal to log a status message from any thread
     
-    def __init__(self):
+    def __init__(self, settings_manager=None):
         super().__init__()
         
-        # Initialize settings manager before other services
-        self.settings_manager = SettingsManager.SettingsManager()
+        # Initialize settings manager before other services (reuse the caller's if given)
+        self.settings_manager = settings_manager or SettingsManager.SettingsManager()
         
         # Get theme from settings
         self.theme = self.settings_manager.get('ui_theme', config.UI_THEME)
@@ -79,8 +89,48 @@ class VoiceCommanderApp(QMainWindow):
         self.keyboard_service = None
         self.shortcut_buttons = {}  # Dictionary to store shortcut buttons
         
+        # In-memory chat log mirroring the chat display; this is what gets saved to disk
+        self._chat_log = []
+        self._chat_entry_by_widget = {}  # TranscriptionListItem -> its entry in _chat_log
+        self._item_by_widget = {}  # TranscriptionListItem -> the QListWidgetItem holding it
+        self._retranscribe_signals = set()  # Keeps in-flight retranscription signal objects alive
+        self._playing_widgets = set()  # Item widgets currently shown in the playing state
+        self._sound_cache = OrderedDict()  # audio path -> (decoded pygame Sound, size in bytes), least recently used first
+        self._sound_cache_bytes = 0
+        self._mic_switch = None  # (signals, device index, device name, was transcribing) while switching
+        self._mic_switch_queued = None  # (device index, device name) requested while a switch was running
+        
+        # Chat history saves are coalesced by a single-shot timer and written on a
+        # single-thread pool, so writes stay in order and never block the UI
+        self._io_pool = QThreadPool(self)
+        self._io_pool.setMaxThreadCount(1)
+        self._history_last_written = {}  # history path -> hash of the bytes last written there (I/O pool only)
+        self._save_timer = QTimer(self)
+        self._save_timer.setSingleShot(True)
+        self._save_timer.setInterval(1500)
+        self._save_timer.timeout.connect(self._do_save_chat_history)
+        
+        # Status messages are buffered and appended to the log in one go
+        self._log_pending = []
+        self._log_timer = QTimer(self)
+        self._log_timer.setSingleShot(True)
+        self._log_timer.setInterval(50)
+        self._log_timer.timeout.connect(self._flush_log)
+        
+        # Last applied (text, is_active, enabled) per control button, so that
+        # update_ui_state only touches Qt when something actually changed
+        self._last_btn_state = {'record': None, 'ptt': None, 'mute': None, 'paste': None}
+        
+        # Single timer watching the channel of the currently playing item; it only runs during playback
+        self._active_playback = None  # (channel, item_widget)
+        self._playback_timer = QTimer(self)
+        self._playback_timer.setInterval(100)
+        self._playback_timer.timeout.connect(self._check_playback_finished)
+        
         # Connect signals
         self.clear_chat_signal.connect(self._clear_chat_display)
+        self.new_chat_signal.connect(self.new_chat)
+        self.log_status_signal.connect(self.log_status)
         
         # Initialize status_text for early logging
         self.status_text = None
@@ -227,11 +277,9 @@ class VoiceCommanderApp(QMainWindow):
         self.setWindowTitle("Voice Commander")
         self.setMinimumSize(800, 600)
         
-        # Get theme colors
-        colors = ThemeManager.get_theme(self.theme)
-        
         # Create central widget
         central_widget = QWidget()
+        central_widget.setObjectName("centralWidget")  # Styled by the window stylesheet
         self.setCentralWidget(central_widget)
         
         # Main layout
@@ -261,12 +309,9 @@ class VoiceCommanderApp(QMainWindow):
         
         # Add title with larger, bolder font and transparent background
         chat_label = QLabel("Voice Commander")
-        chat_label.setStyleSheet("font-weight: bold; font-size: 16px; color: #505a7a; background-color: transparent;")
+        chat_label.setObjectName("titleLabel")  # Styled by the window stylesheet
         header_layout.addWidget(chat_label)
         
-        # Get button style
-        button_style = ThemeManager.get_inactive_button_style(self.theme)
-        
         # Push buttons to the right side
         header_layout.addStretch(1)
         
@@ -274,8 +319,7 @@ class VoiceCommanderApp(QMainWindow):
         self.reset_button = QPushButton("New Chat")
         self.reset_button.setText("🔄 New Chat")  # Unicode refresh icon
         self.reset_button.clicked.connect(self.new_chat)
-        # Apply base style and add larger font size specifically for this button's icon
-        self.reset_button.setStyleSheet(button_style + " font-size: 14pt;")
+        self.reset_button.setProperty("state", "inactive")  # Styled by the window stylesheet
         header_layout.addWidget(self.reset_button)
         
         # Add the header to the chat layout
@@ -285,22 +329,6 @@ class VoiceCommanderApp(QMainWindow):
         self.chat_display = QListWidget()
         self.chat_display.setAlternatingRowColors(True)
         self.chat_display.setHorizontalScrollBarPolicy(Qt.ScrollBarPolicy.ScrollBarAlwaysOff)
-        self.chat_display.setStyleSheet(f"""
-            QListWidget {{
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                background-color: {colors['bg_secondary']};
-                alternate-background-color: {colors['bg_primary']};
-                padding: 2px;
-            }}
-            QListWidget::item {{
-                padding: 0px;
-                border-radius: 6px;
-            }}
-            QListWidget::item:hover {{
-                background-color: {colors['bg_accent']};
-            }}
-        """)
         self.chat_display.setFont(QFont("Segoe UI", 11))
         self.chat_display.setSpacing(0)
         self.chat_display.setWordWrap(True)
@@ -310,32 +338,13 @@ class VoiceCommanderApp(QMainWindow):
         
         # Controls area
         self.controls_container = QWidget()
-        self.controls_container.setStyleSheet(f"background-color: {colors['bg_primary']};")
+        self.controls_container.setObjectName("controlsContainer")  # Styled by the window stylesheet
         controls_layout = QVBoxLayout(self.controls_container)
         controls_layout.setSpacing(10)
         controls_layout.setContentsMargins(0, 0, 0, 0)
         
-        # Define active and inactive button styles from ThemeManager
-        active_button_style = ThemeManager.get_active_button_style(self.theme)
-        inactive_button_style = ThemeManager.get_inactive_button_style(self.theme)
-        
         # Group the controls in a grid layout
         controls_group = QGroupBox("Controls")
-        controls_group.setStyleSheet(f"""
-            QGroupBox {{
-                font-weight: bold;
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-                margin-top: 12px;
-                background-color: {colors['bg_secondary']};
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-                color: {colors['text_primary']};
-            }}
-        """)
         controls_grid = QGridLayout()
         controls_grid.setVerticalSpacing(15)
         controls_grid.setHorizontalSpacing(15)
@@ -349,28 +358,28 @@ class VoiceCommanderApp(QMainWindow):
         self.record_button = QPushButton(" Recording")
         self.record_button.setText("⏺️ Start Transcription")  # Unicode record icon
         self.record_button.clicked.connect(self.toggle_recording)
-        self.record_button.setStyleSheet(inactive_button_style)  # Will be updated in update_ui_state()
+        self.record_button.setProperty("state", "inactive")  # Will be updated in update_ui_state()
         button_layout.addWidget(self.record_button)
         
         # Push to Talk button
         self.push_to_talk_button = QPushButton("Push to Talk")
         self.push_to_talk_button.setText("🎤 Push to Talk")  # Unicode microphone icon
         self.push_to_talk_button.clicked.connect(self.toggle_push_to_talk)
-        self.push_to_talk_button.setStyleSheet(inactive_button_style)  # Will be updated in update_ui_state()
+        self.push_to_talk_button.setProperty("state", "inactive")  # Will be updated in update_ui_state()
         button_layout.addWidget(self.push_to_talk_button)
         
         # LLM processing toggle button
         self.mute_button = QPushButton("AI Processing: On")
         self.mute_button.setText("🤖 AI Processing: On")  # Unicode robot icon
         self.mute_button.clicked.connect(self.toggle_mute)
-        self.mute_button.setStyleSheet(inactive_button_style)  # Will be updated in update_ui_state()
+        self.mute_button.setProperty("state", "inactive")  # Will be updated in update_ui_state()
         button_layout.addWidget(self.mute_button)
         
         # Automatic paste toggle button
         self.paste_button = QPushButton("Auto-Paste: On")
         self.paste_button.setText("📋 Auto-Paste: On")  # Unicode clipboard icon
         self.paste_button.clicked.connect(self.toggle_paste)
-        self.paste_button.setStyleSheet(inactive_button_style)  # Will be updated in update_ui_state()
+        self.paste_button.setProperty("state", "inactive")  # Will be updated in update_ui_state()
         button_layout.addWidget(self.paste_button)
         
         # Create a widget to hold the button layout
@@ -387,7 +396,6 @@ class VoiceCommanderApp(QMainWindow):
         # Language selection
         lang_layout = QHBoxLayout()
         lang_label = QLabel("Language:")
-        lang_label.setStyleSheet(f"background-color: {colors['bg_secondary']}; color: {colors['text_primary']};")
         lang_layout.addWidget(lang_label)
         self.language_combo = QComboBox()
         self.language_combo.setMinimumWidth(120)  # Match button width
@@ -395,13 +403,14 @@ class VoiceCommanderApp(QMainWindow):
         # Add languages from config
         for code, name in config.AVAILABLE_LANGUAGES.items():
             self.language_combo.addItem(name, code)
+        # Map language code -> combo row, so lookups don't walk the combo
+        self._lang_row = {code: row for row, code in enumerate(config.AVAILABLE_LANGUAGES)}
             
         # Set current language from settings
         saved_language = self.settings_manager.get('language', 'en')
-        for i in range(self.language_combo.count()):
-            if self.language_combo.itemData(i) == saved_language:
-                self.language_combo.setCurrentIndex(i)
-                break
+        row = self._lang_row.get(saved_language)
+        if row is not None:
+            self.language_combo.setCurrentIndex(row)
                 
         self.language_combo.currentIndexChanged.connect(self.change_language)
         lang_layout.addWidget(self.language_combo)
@@ -410,7 +419,7 @@ class VoiceCommanderApp(QMainWindow):
         self.settings_button = QPushButton("Settings")
         self.settings_button.setText("⚙️ Settings")  # Unicode gear icon
         self.settings_button.clicked.connect(self.open_settings_dialog)
-        self.settings_button.setStyleSheet(button_style)
+        self.settings_button.setProperty("state", "inactive")  # Styled by the window stylesheet
         lang_layout.addWidget(self.settings_button)
         
         # Add language selection to the combined layout
@@ -425,26 +434,13 @@ class VoiceCommanderApp(QMainWindow):
         
         # Status area
         status_group = QGroupBox("Status")
-        status_group.setStyleSheet(f"""
-            QGroupBox {{ 
-                padding-top: 15px; 
-                margin-top: 5px; 
-                background-color: {colors['bg_secondary']};
-                border: 1px solid {colors['border']};
-                border-radius: 8px;
-            }}
-            QGroupBox::title {{
-                subcontrol-origin: margin;
-                left: 10px;
-                padding: 0 5px;
-                color: {colors['text_primary']};
-            }}
-        """)
         status_layout = QVBoxLayout()
         status_layout.setContentsMargins(10, 5, 10, 5)
         
-        self.status_text = QTextEdit()
+        self.status_text = QPlainTextEdit()
         self.status_text.setReadOnly(True)
+        self.status_text.setMaximumBlockCount(5000)  # Keep the log bounded
+        self.status_text.setUndoRedoEnabled(False)  # Append-only, no undo history needed
         self.status_text.setMaximumHeight(80)  # Slightly reduce maximum height
         status_layout.addWidget(self.status_text)
         
@@ -475,169 +471,28 @@ class VoiceCommanderApp(QMainWindow):
         self.settings_manager.set('ui_theme', new_theme)
         self.theme = new_theme
         
-        # Apply new theme to main window
-        self.setStyleSheet(ThemeManager.get_main_window_style(new_theme))
-        
-        # Get theme colors for direct widget styling
-        colors = ThemeManager.get_theme(new_theme)
-        
-        # Explicitly style central widget to ensure main background color is applied
-        self.centralWidget().setStyleSheet(f"background-color: {colors['bg_primary']};")
-        
-        # Update button styles in UI
-        self.update_ui_state()
-        
-        # Apply theme to all widgets recursively
-        self.apply_theme_to_all_widgets(self, new_theme, colors)
-        
-        # Update the transcription item themes separately as they need special handling
-        self.update_transcription_item_themes()
+        # Restyle everything with painting suspended, so the window repaints once at the end
+        self.setUpdatesEnabled(False)
+        try:
+            # Apply new theme to main window; containers, labels, combo boxes, group boxes,
+            # buttons, the status log and the chat list are all styled by this one sheet
+            style = ThemeManager.get_main_window_style(new_theme)
+            if self.styleSheet() != style:  # An identical sheet would still be re-parsed and re-polished
+                self.setStyleSheet(style)
+            
+            # Update the transcription item themes separately as they need special handling
+            self.update_transcription_item_themes()
+        finally:
+            self.setUpdatesEnabled(True)
         
         # Log the change
         self.log_status(f"Switched to {new_theme} theme")
         
-    def apply_theme_to_all_widgets(self, parent_widget, theme, colors):
-        """Recursively apply theme to all widgets"""
-        # Explicitly style key container widgets
-        self.centralWidget().setStyleSheet(f"background-color: {colors['bg_primary']};")
-        self.controls_container.setStyleSheet(f"background-color: {colors['bg_primary']};")
-        
-        # Process all child widgets
-        for child in parent_widget.findChildren(QWidget):
-            # Apply specific styling based on widget type
-            
-            # QLabel styling
-            if isinstance(child, QLabel):
-                # Check if it's the app title label or app icon (special styling with transparent background)
-                if child.text() == "Voice Commander" and child.parent() == self.centralWidget():
-                    child.setStyleSheet(f"font-weight: bold; font-size: 16px; {ThemeManager.get_label_style(theme, is_transparent=True)}")
-                # Check if it's the app icon
-                elif not child.text() and child.pixmap() and child.parent() == self.centralWidget():
-                    child.setStyleSheet("background-color: transparent;")
-                else:
-                    child.setStyleSheet(ThemeManager.get_label_style(theme))
-            
-            # QComboBox styling
-            elif isinstance(child, QComboBox):
-                # Ensure selection color contrasts well
-                selection_text_color = colors["text_primary"] if theme == "light" else "#ffffff" # Dark text on light accent, White text on dark accent
-                child.setStyleSheet(f"""
-                    QComboBox {{
-                        border: 1px solid {colors["border"]};
-                        border-radius: 6px;
-                        padding: 5px;
-                        background-color: {colors["bg_primary"]}; /* Use primary bg */
-                        color: {colors["text_primary"]};
-                    }}
-                    QComboBox::drop-down {{
-                        border: none;
-                        width: 24px;
-                        /* TODO: Consider styling the dropdown arrow based on theme */
-                    }}
-                    QComboBox QAbstractItemView {{
-                        background-color: {colors["bg_primary"]}; /* Use primary bg */
-                        border: 1px solid {colors["border"]};
-                        border-radius: 6px;
-                        selection-background-color: {colors["bg_accent"]};
-                        selection-color: {selection_text_color}; /* Ensure contrast */
-                    }}
-                """)
-            
-            # QGroupBox styling
-            elif isinstance(child, QGroupBox):
-                child.setStyleSheet(f"""
-                    QGroupBox {{
-                        font-weight: bold;
-                        border: 1px solid {colors["border"]};
-                        border-radius: 8px;
-                        margin-top: 12px;
-                        background-color: {colors["bg_primary"]}; /* Use primary bg */
-                    }}
-                    QGroupBox::title {{
-                        subcontrol-origin: margin;
-                        left: 10px;
-                        padding: 0 5px;
-                        color: {colors["text_primary"]};
-                        background-color: {colors["bg_primary"]}; /* Title bg matches GroupBox */
-                        border-radius: 4px; /* Optional: Slightly round title bg */
-                    }}
-                """)
-            
-            # QTextEdit styling (like status text)
-            elif isinstance(child, QTextEdit):
-                 # Define selection text color for contrast
-                selection_text_color = "#ffffff" if theme == "light" else colors["bg_primary"] # White on light accent, Dark bg color on dark accent
-                child.setStyleSheet(f"""
-                    border: 1px solid {colors["border"]};
-                    border-radius: 8px;
-                    background-color: {colors["bg_primary"]}; /* Use primary bg */
-                    selection-background-color: {colors["accent"]};
-                    selection-color: {selection_text_color}; /* Ensure contrast */
-                    color: {colors["text_primary"]};
-                """)
-            
-            # QListWidget styling (chat display)
-            elif isinstance(child, QListWidget):
-                # Ensure selection color contrasts well
-                selection_text_color = colors["text_primary"] if theme == "light" else "#ffffff" # Dark text on light accent, White text on dark accent
-                child.setStyleSheet(f"""
-                    QListWidget {{
-                        border: 1px solid {colors["border"]};
-                        border-radius: 8px;
-                        background-color: {colors["bg_primary"]}; /* Use primary bg */
-                        alternate-background-color: {colors["bg_primary"]}; /* Use primary bg - remove alternation */
-                        padding: 2px;
-                    }}
-                    QListWidget::item {{
-                        padding: 0px;
-                        border-radius: 6px;
-                        color: {colors["text_primary"]}; /* Ensure item text color is set */
-                        background-color: transparent; /* Ensure item background is transparent by default */
-                    }}
-                    QListWidget::item:hover {{
-                        background-color: {colors["bg_accent"]}; /* Hover uses accent bg */
-                    }}
-                    QListWidget::item:selected {{
-                         background-color: {colors["accent"]}; /* Selection uses main accent */
-                         color: {selection_text_color}; /* Ensure contrast for selected text */
-                         border-radius: 6px;
-                    }}
-                """)
-            
-            # General container QWidget styling
-            elif isinstance(child, QWidget) and not isinstance(child, QPushButton):
-                # Only style direct container widgets, not those that appear in layouts
-                if child.layout() is not None:
-                    # This is a container widget with a layout
-                    child.setStyleSheet(f"background-color: {colors['bg_primary']};")
-            
-            # Force update of the widget
-            child.style().unpolish(child)
-            child.style().polish(child)
-            child.update()
-    
     def update_transcription_item_themes(self):
         """Update the theme for all transcription items in the chat display"""
-        styles = ThemeManager.get_transcription_item_styles(self.theme)
-        for i in range(self.chat_display.count()):
-            item = self.chat_display.item(i)
-            widget = self.chat_display.itemWidget(item)
-
-            # Update TranscriptionListItem widgets
-            if hasattr(widget, 'setTheme'):
-                widget.setTheme(self.theme) # Assumes setTheme uses styles from ThemeManager
-                # Ensure the container widget itself has the correct background
-                widget.setStyleSheet(styles["container_style"])
-
-            # Update AI response container widgets (which contain a QLabel)
-            elif isinstance(widget, QWidget) and widget.layout():
-                # Set the container background first
-                widget.setStyleSheet(styles["container_style"])
-                for j in range(widget.layout().count()):
-                    child = widget.layout().itemAt(j).widget()
-                    if isinstance(child, QLabel):
-                        # This is an AI response, update its style
-                        child.setStyleSheet(styles["ai_response_style"])
+        # Every chat row is a TranscriptionListItem tracked in _item_by_widget
+        for widget in self._item_by_widget:
+            widget.setTheme(self.theme)
 
     def open_settings_dialog(self):
         """Open the settings dialog"""
@@ -657,74 +512,144 @@ class VoiceCommanderApp(QMainWindow):
             
             if new_mic_index is not None and new_mic_index != current_mic_index:
                 # Get the device name for logging
-                device_name = ""
-                for i in range(settings_dialog.microphone_combo.count()):
-                    if settings_dialog.microphone_combo.itemData(i) == new_mic_index:
-                        device_name = settings_dialog.microphone_combo.itemText(i)
-                        break
-                
-                # Stop audio processing temporarily
-                if hasattr(self, 'audio_worker'):
-                    self.audio_worker.stop()
-                    
-                # Pause transcription
-                was_transcribing = self.transcription_service.is_transcribing
-                if was_transcribing:
-                    self.transcription_service.pause_transcription()
+                device_name = settings_dialog.get_selected_microphone_name()
                 
-                # Switch the device
-                if self.audio_service.switch_device(new_mic_index):
-                    # Save the selection to settings
-                    self.settings_manager.set('microphone_index', new_mic_index)
-                    self.settings_manager.set('microphone_name', device_name)
-                    
-                    # Log the change
-                    self.log_status(f"Microphone switched to {device_name}")
-                    
-                    # Important: We need to recreate the recognizer with the new device's parameters
-                    self.transcription_service.reset_recognizer()
-                    
-                    # Wait a moment for audio system to stabilize
-                    time.sleep(0.5)
-                    
-                    # Restart audio processing
-                    self.start_audio_processing()
-                    
-                    # Resume transcription if it was active
-                    if was_transcribing:
-                        self.transcription_service.resume_transcription()
-                else:
-                    self.log_status(f"Failed to switch to microphone: {device_name}")
+                self._switch_microphone(new_mic_index, device_name)
 
-    def update_ui_state(self):
-        """Update UI elements based on current application state"""
-        # Define active button style (blue)
-        active_button_style = ThemeManager.get_active_button_style(self.theme)
+    def _switch_microphone(self, new_mic_index, device_name):
+        """Switch to another microphone; the device is opened on a worker thread"""
+        if self._mic_switch is not None:
+            # A switch is still running: switch again once it's done (the latest choice wins)
+            self._mic_switch_queued = (new_mic_index, device_name)
+            return
+            
+        # Stop audio processing temporarily
+        if hasattr(self, 'audio_worker'):
+            self.audio_worker.stop()
+            
+        # Pause transcription
+        was_transcribing = self.transcription_service.is_transcribing
+        if was_transcribing:
+            self.transcription_service.pause_transcription()
         
-        # Inactive button style
-        inactive_button_style = ThemeManager.get_inactive_button_style(self.theme)
+        self._start_microphone_switch(new_mic_index, device_name, was_transcribing)
+
+    def _start_microphone_switch(self, new_mic_index, device_name, was_transcribing):
+        """Start the worker that opens the new device; _on_microphone_switched picks up from there"""
+        job = MicrophoneSwitchRunnable(self.audio_service, new_mic_index)
+        job.signals.finished.connect(self._on_microphone_switched)
+        # Keeping the signals object here keeps it alive and identifies the job in the slot
+        self._mic_switch = (job.signals, new_mic_index, device_name, was_transcribing)
+        QThreadPool.globalInstance().start(job)
+
+    @pyqtSlot(bool)
+    def _on_microphone_switched(self, success):
+        """Finish a microphone switch once the worker has opened the device"""
+        if self._mic_switch is None or self.sender() is not self._mic_switch[0]:
+            return  # Not the switch we are waiting for
+        _, new_mic_index, device_name, was_transcribing = self._mic_switch
         
+        if success:
+            # Save the selection to settings
+            self.settings_manager.set('microphone_index', new_mic_index)
+            self.settings_manager.set('microphone_name', device_name)
+            
+            # Log the change
+            self.log_status(f"Microphone switched to {device_name}")
+        else:
+            self.log_status(f"Failed to switch to microphone: {device_name}")
+            
+        if success and self._mic_switch_queued is None:
+            # Important: We need to recreate the recognizer with the new device's parameters
+            self.transcription_service.reset_recognizer()
+            
+            # Give the audio system a moment to stabilize without blocking the event loop;
+            # the switch counts as running (with no worker) until audio processing restarts
+            self._mic_switch = (None, new_mic_index, device_name, was_transcribing)
+            QTimer.singleShot(500, self._finish_microphone_switch)
+            return
+            
+        self._mic_switch = None
+        self._start_queued_microphone_switch(was_transcribing)
+
+    def _finish_microphone_switch(self):
+        """Restart audio processing after a microphone switch"""
+        was_transcribing = self._mic_switch[3]
+        self._mic_switch = None
+        if self._start_queued_microphone_switch(was_transcribing):
+            return
+            
+        self.start_audio_processing()
+        
+        # Resume transcription if it was active
+        if was_transcribing:
+            self.transcription_service.resume_transcription()
+
+    def _start_queued_microphone_switch(self, was_transcribing):
+        """
+        Start the switch requested while the previous one was running, if any
+        
+        Audio processing and transcription are still stopped at this point, so whether
+        transcription has to be resumed carries over from the first switch.
+        
+        Returns:
+            True if a queued switch was started
+        """
+        queued, self._mic_switch_queued = self._mic_switch_queued, None
+        if queued is None:
+            return False
+        self._start_microphone_switch(*queued, was_transcribing)
+        return True
+
+    def update_ui_state(self):
+        """Update UI elements based on current application state"""
+        self._refresh_record_buttons()
+        self._refresh_mute_button()
+        self._refresh_paste_button()
+    
+    def _refresh_record_buttons(self):
+        """Update the recording and push-to-talk buttons"""
         # Update recording button - only show active when recording
         is_recording = self.transcription_service.is_transcribing
         is_push_to_talk = self.transcription_service.is_push_to_talk_mode
-        self.record_button.setText("⏺️ Recording" if is_recording else "⏺️ Start Transcription")
-        self.record_button.setStyleSheet(active_button_style if is_recording else inactive_button_style)
         # Disable the record button when push-to-talk is active
-        self.record_button.setEnabled(not is_push_to_talk)
+        self._apply_button_state('record', self.record_button,
+                                 "⏺️ Recording" if is_recording else "⏺️ Start Transcription",
+                                 is_recording, not is_push_to_talk)
         
         # Update push to talk button
-        self.push_to_talk_button.setText("🎤 Stop Talking" if is_push_to_talk else "🎤 Push to Talk")
-        self.push_to_talk_button.setStyleSheet(active_button_style if is_push_to_talk else inactive_button_style)
-        
-        # Update mute button
+        self._apply_button_state('ptt', self.push_to_talk_button,
+                                 "🎤 Stop Talking" if is_push_to_talk else "🎤 Push to Talk",
+                                 is_push_to_talk)
+    
+    def _refresh_mute_button(self):
+        """Update the AI processing button"""
         is_muted = self.groq_service.mute_llm
-        self.mute_button.setText(f"🤖 AI Processing: {'Off' if is_muted else 'On'}")
-        self.mute_button.setStyleSheet(inactive_button_style if is_muted else active_button_style)
-        
-        # Update paste button
+        self._apply_button_state('mute', self.mute_button,
+                                 f"🤖 AI Processing: {'Off' if is_muted else 'On'}",
+                                 not is_muted)
+    
+    def _refresh_paste_button(self):
+        """Update the auto-paste button"""
         is_paste_on = self.groq_service.automatic_paste
-        self.paste_button.setText(f"📋 Auto-Paste: {'On' if is_paste_on else 'Off'}")
-        self.paste_button.setStyleSheet(active_button_style if is_paste_on else inactive_button_style)
+        self._apply_button_state('paste', self.paste_button,
+                                 f"📋 Auto-Paste: {'On' if is_paste_on else 'Off'}",
+                                 is_paste_on)
+    
+    def _apply_button_state(self, key, button, text, is_active, enabled=True):
+        """Apply text, active state and enabled state to a button, skipping unchanged values"""
+        last_text, last_active, last_enabled = self._last_btn_state[key] or (None, None, None)
+        if text != last_text:
+            button.setText(text)
+        if is_active != last_active:
+            # Re-polish so the [state=...] rules of the button stylesheet are re-evaluated
+            # without parsing the stylesheet again
+            button.setProperty("state", "active" if is_active else "inactive")
+            button.style().unpolish(button)
+            button.style().polish(button)
+        if enabled != last_enabled:
+            button.setEnabled(enabled)
+        self._last_btn_state[key] = (text, is_active, enabled)
     
     def start_audio_processing(self):
         """Start the audio processing thread"""
@@ -749,7 +674,7 @@ class VoiceCommanderApp(QMainWindow):
         self.add_transcription_item(timestamp, text, audio_path)
         
         # Save chat history after adding a new item
-        self.save_chat_history()
+        self._save_timer.start()
     
     @pyqtSlot(str)
     def on_llm_response(self, text):
@@ -757,7 +682,7 @@ class VoiceCommanderApp(QMainWindow):
         self.add_ai_response(text)
         
         # Save chat history after adding the AI response
-        self.save_chat_history()
+        self._save_timer.start()
     
     @pyqtSlot(str)
     def on_error(self, error_msg):
@@ -768,7 +693,7 @@ class VoiceCommanderApp(QMainWindow):
     def on_audio_state_changed(self, is_recording):
         """Handle audio state change"""
         if hasattr(self, 'record_button') and self.record_button is not None:
-            self.record_button.setText("Recording" if is_recording else "Start Transcription")
+            self._refresh_record_buttons()
         else:
             logger.warning("record_button not initialized when audio state changed")
         
@@ -780,24 +705,36 @@ class VoiceCommanderApp(QMainWindow):
             print(message)
             return
             
-        cursor = self.status_text.textCursor()
-        cursor.movePosition(QTextCursor.MoveOperation.End)
-        cursor.insertText(f"{message}\n")
-        
-        # Scroll to bottom
-        self.status_text.setTextCursor(cursor)
-        self.status_text.ensureCursorVisible()
+        # The log timer can only be started from the GUI thread, so messages from
+        # worker threads are queued over to it
+        if QThread.currentThread() is not self.thread():
+            self.log_status_signal.emit(message)
+            return
+            
+        self._log_pending.append(message)
+        # The first message of a batch sets the flush deadline; restarting the timer on every
+        # message would keep postponing the flush for as long as messages keep arriving
+        if not self._log_timer.isActive():
+            self._log_timer.start()
+        
+    def _flush_log(self):
+        """Append all buffered status messages to the status log"""
+        if not self._log_pending:
+            return
+        # appendPlainText keeps the view pinned to the bottom if it was already there
+        self.status_text.appendPlainText("\n".join(self._log_pending))
+        self._log_pending.clear()
         
-    def add_transcription_item(self, timestamp, text, audio_path):
+    def add_transcription_item(self, timestamp, text, audio_path, scroll=True):
         """Adds a new transcription item (user message) to the chat display"""
         # Create a custom widget for the transcription item, passing theme and is_ai=False
         item_widget = TranscriptionListItem(theme=self.theme, is_ai=False)
         item_widget.setData(timestamp, text, audio_path)
 
-        # Connect buttons
-        item_widget.copy_button.clicked.connect(lambda _, t=text: self.copy_to_clipboard(t))
-        item_widget.play_button.clicked.connect(lambda _, p=audio_path, w=item_widget: self.play_audio(p, w))
-        item_widget.transcribe_button.clicked.connect(lambda _, p=audio_path, w=item_widget: self.retranscribe_audio(p, w))
+        # Connect the item's requests (the slots identify the item via sender())
+        item_widget.copyRequested.connect(self.copy_to_clipboard)
+        item_widget.playRequested.connect(self._on_play_requested)
+        item_widget.transcribeRequested.connect(self._on_transcribe_requested)
 
         # Create a QListWidgetItem to hold the custom widget
         list_item = QListWidgetItem(self.chat_display)
@@ -808,19 +745,26 @@ class VoiceCommanderApp(QMainWindow):
         # Add the item to the list and set the custom widget
         self.chat_display.addItem(list_item)
         self.chat_display.setItemWidget(list_item, item_widget)
+        self._item_by_widget[item_widget] = list_item
 
         # Scroll to the bottom to show the latest message
-        self.chat_display.scrollToBottom()
+        if scroll:
+            self.chat_display.scrollToBottom()
+        
+        # Record the item in the chat log
+        entry = {'type': 'transcription', 'timestamp': timestamp, 'text': text, 'audio_path': audio_path}
+        self._chat_log.append(entry)
+        self._chat_entry_by_widget[item_widget] = entry
 
         # Log the transcription
         logger.info(f"User: {text}")
         
-        # Update the UI state if needed
-        self.update_ui_state()
+        # Update the recording buttons if needed
+        self._refresh_record_buttons()
         
         # Removed call to self.update_transcription_item_themes() - style applied on creation
 
-    def add_ai_response(self, text):
+    def add_ai_response(self, text, scroll=True):
         """Adds an AI response message to the chat display"""
         if not text or text.strip() == "":
             logger.warning("Attempted to add an empty AI response.")
@@ -834,7 +778,7 @@ class VoiceCommanderApp(QMainWindow):
         item_widget.setData(timestamp, text, None) # AI responses don't have audio
         
         # Only connect copy button for AI responses
-        item_widget.copy_button.clicked.connect(lambda _, t=text: self.copy_to_clipboard(t))
+        item_widget.copyRequested.connect(self.copy_to_clipboard)
         
         # Disable play and transcribe buttons for AI responses
         item_widget.play_button.setVisible(False)
@@ -850,9 +794,14 @@ class VoiceCommanderApp(QMainWindow):
         # Add the item to the list and set the custom widget
         self.chat_display.addItem(list_item)
         self.chat_display.setItemWidget(list_item, item_widget)
+        self._item_by_widget[item_widget] = list_item
         
         # Scroll to the bottom
-        self.chat_display.scrollToBottom()
+        if scroll:
+            self.chat_display.scrollToBottom()
+        
+        # Record the item in the chat log
+        self._chat_log.append({'type': 'ai_response', 'text': text})
         
         # Log the AI response
         logger.info(f"AI: {text}")
@@ -861,8 +810,14 @@ class VoiceCommanderApp(QMainWindow):
 
     def _clear_chat_display(self):
         """Slot for clearing the chat display in the UI thread"""
+        # Stop playback first: clear() deletes the item widgets the playback timer still points at
+        self.stop_all_playback()
         if self.chat_display:
             self.chat_display.clear()
+        self._chat_log.clear()
+        self._chat_entry_by_widget.clear()
+        self._item_by_widget.clear()
+        self._playing_widgets.clear()
             
     def on_close(self, event):
         """Handle window close event"""
@@ -911,8 +866,8 @@ class VoiceCommanderApp(QMainWindow):
         # Call the transcription service method
         self.transcription_service.toggle_push_to_talk()
         
-        # Update the UI state to reflect current state
-        self.update_ui_state()
+        # Update the recording buttons to reflect current state
+        self._refresh_record_buttons()
         
         # Log status change
         is_active = self.transcription_service.is_push_to_talk_mode
@@ -930,12 +885,9 @@ class VoiceCommanderApp(QMainWindow):
         
         # Only attempt TTS if we're unmuting or were not muted before
         if not self.groq_service.mute_llm:
-            try:
-                self.groq_service.safe_tts_say(f"AI {status}")
-            except Exception as e:
-                self.log_status(f"TTS error: {e}")
+            self._announce(f"AI {status}")
         
-        self.update_ui_state()
+        self._refresh_mute_button()
     
     def toggle_paste(self):
         """Toggle paste state"""
@@ -948,12 +900,9 @@ class VoiceCommanderApp(QMainWindow):
         
         # Only attempt TTS if not muted
         if not self.groq_service.mute_llm:
-            try:
-                self.groq_service.safe_tts_say(f"Automatic paste {status}")
-            except Exception as e:
-                self.log_status(f"TTS error: {e}")
+            self._announce(f"Automatic paste {status}")
         
-        self.update_ui_state()
+        self._refresh_paste_button()
         
     def new_chat(self):
         """Clear the chat history and start a new chat"""
@@ -967,21 +916,27 @@ class VoiceCommanderApp(QMainWindow):
             
             # Only attempt TTS if not muted
             if not self.groq_service.mute_llm:
-                try:
-                    self.groq_service.safe_tts_say("New chat started")
-                except Exception as e:
-                    self.log_status(f"TTS error: {e}")
+                self._announce("New chat started")
                     
             # Save the empty chat history
-            self.save_chat_history()
+            self._save_timer.start()
         except Exception as e:
             self.log_status(f"Error starting new chat: {e}")
             logger.error(f"Error in new_chat: {e}", exc_info=True)
     
+    def _announce(self, text):
+        """Speak a short announcement (safe_tts_say speaks on its own thread and returns right away)"""
+        try:
+            self.groq_service.safe_tts_say(text)
+        except Exception as e:
+            self.log_status(f"TTS error: {e}")
+    
     # Maintain backward compatibility
     def reset_chat(self):
-        """Alias for new_chat for backward compatibility"""
-        self.new_chat()
+        """Alias for new_chat for backward compatibility (safe to call from any thread)"""
+        # The voice RESET command calls this on the audio worker thread, where new_chat
+        # can't start the GUI thread's save timer, so hand the reset to the GUI thread
+        self.new_chat_signal.emit()
     
     def change_language(self, index):
         """Change the language based on combo box selection"""
@@ -1003,23 +958,14 @@ class VoiceCommanderApp(QMainWindow):
             
             # Only attempt TTS if not muted
             if not self.groq_service.mute_llm:
-                try:
-                    self.groq_service.safe_tts_say(f"Language switched to {lang_name}")
-                except Exception as e:
-                    self.log_status(f"TTS error: {e}")
+                self._announce(f"Language switched to {lang_name}")
                     
     def on_shortcut_triggered(self, action_name):
         """Handle when a keyboard shortcut is triggered"""
         logger.info(f"Shortcut triggered for action: {action_name}")
         
-        # Log the shortcut usage to the status
-        shortcut_key = self.keyboard_service.get_shortcut(action_name)
-        
-        # Try to get a friendly name for display
-        display_key = shortcut_key
-        if shortcut_key and (shortcut_key.startswith("vk") or shortcut_key.startswith("Key_0x")):
-            display_key = self.keyboard_service.get_friendly_key_name(shortcut_key)
-            
+        # Log the shortcut usage to the status (the stored display string is already friendly)
+        display_key = self.keyboard_service.get_shortcut(action_name)
         self.log_status(f"Keyboard shortcut [{display_key}] activated: {action_name}")
         
     def on_keyboard_error(self, error_msg):
@@ -1035,14 +981,12 @@ class VoiceCommanderApp(QMainWindow):
             return
             
         # Find the index for the current language
-        current_lang = self.groq_service.language
-        for i in range(self.language_combo.count()):
-            if self.language_combo.itemData(i) == current_lang:
-                # Block signals to prevent recursive calls
-                self.language_combo.blockSignals(True)
-                self.language_combo.setCurrentIndex(i)
-                self.language_combo.blockSignals(False)
-                break
+        row = self._lang_row.get(self.groq_service.language)
+        if row is not None:
+            # Block signals to prevent recursive calls
+            self.language_combo.blockSignals(True)
+            self.language_combo.setCurrentIndex(row)
+            self.language_combo.blockSignals(False)
                 
     def load_chat_history(self):
         """Load chat history from disk"""
@@ -1071,8 +1015,8 @@ class VoiceCommanderApp(QMainWindow):
                 
             # Load the history file
             try:
-                with open(history_path, 'r', encoding='utf-8') as f:
-                    chat_history = json.load(f)
+                with open(history_path, 'rb') as f:
+                    chat_history = decode_chat_history(f.read())
                     
                 # Verify it's a valid list
                 if not isinstance(chat_history, list):
@@ -1082,31 +1026,40 @@ class VoiceCommanderApp(QMainWindow):
                 # Proceed only if we have valid history
                 if len(chat_history) > 0:
                     # Clear current chat display
-                    self.chat_display.clear()
+                    self._clear_chat_display()
                     
-                    # Add each chat item to the display
-                    for item in chat_history:
-                        if not isinstance(item, dict):
-                            continue
-                            
-                        item_type = item.get('type')
-                        if item_type == 'transcription':
-                            timestamp = item.get('timestamp', '')
-                            text = item.get('text', '')
-                            audio_path = item.get('audio_path')
-                            
-                            # Check if audio file exists
-                            if audio_path and not os.path.exists(audio_path):
-                                self.log_status(f"Warning: Audio file not found: {audio_path}")
-                                audio_path = None
+                    # Add each chat item to the display in bulk: no repaints, signals or
+                    # scrolling until everything is in place
+                    self.chat_display.setUpdatesEnabled(False)
+                    self.chat_display.blockSignals(True)
+                    try:
+                        for item in chat_history:
+                            if not isinstance(item, dict):
+                                continue
+                                
+                            item_type = item.get('type')
+                            if item_type == 'transcription':
+                                timestamp = item.get('timestamp', '')
+                                text = item.get('text', '')
+                                audio_path = item.get('audio_path')
                                 
-                            # Add transcription item
-                            self.add_transcription_item(timestamp, text, audio_path)
-                            
-                        elif item_type == 'ai_response':
-                            text = item.get('text', '')
-                            # Add AI response
-                            self.add_ai_response(text)
+                                # Check if audio file exists
+                                if audio_path and not os.path.exists(audio_path):
+                                    self.log_status(f"Warning: Audio file not found: {audio_path}")
+                                    audio_path = None
+                                    
+                                # Add transcription item
+                                self.add_transcription_item(timestamp, text, audio_path, scroll=False)
+                                
+                            elif item_type == 'ai_response':
+                                text = item.get('text', '')
+                                # Add AI response
+                                self.add_ai_response(text, scroll=False)
+                    finally:
+                        self.chat_display.blockSignals(False)
+                        self.chat_display.setUpdatesEnabled(True)
+                    self.chat_display.scrollToBottom()
+                    self.chat_display.viewport().update()
                 
                     # Also initialize the groq service chat with history
                     if hasattr(self.groq_service, 'InitializeChat'):
@@ -1120,7 +1073,8 @@ class VoiceCommanderApp(QMainWindow):
                             if item.get('type') == 'transcription':
                                 self.groq_service.AddUserMessage(item.get('text', ''))
                             elif item.get('type') == 'ai_response':
-                                self.add_ai_response(item.get('text', ''))
+                                # Already displayed above; only restore it in the LLM context
+                                self.groq_service.RestoreAssistantMessage(item.get('text', ''))
                 
                     # Log success
                     self.log_status(f"Loaded {len(chat_history)} chat messages from history")
@@ -1132,58 +1086,22 @@ class VoiceCommanderApp(QMainWindow):
             self.log_status(f"Error loading chat history: {e}")
             logger.error(f"Error loading chat history: {e}", exc_info=True)
     
-    def save_chat_history(self):
-        """Save the current chat history to disk"""
+    def _chat_history_path(self):
+        """Get the chat history file path, creating the save folder if needed"""
+        # Get the history save path from config
+        save_folder = config.CHAT_HISTORY_SAVE_FOLDER
+        # Ensure the folder exists
+        os.makedirs(save_folder, exist_ok=True)
+        
+        # Create history filename
+        return os.path.join(save_folder, "chat_history.json")
+    
+    def _do_save_chat_history(self):
+        """Write a snapshot of the chat log on the I/O thread pool"""
         try:
-            # Skip if no chat display exists or it's empty
-            if not hasattr(self, 'chat_display') or self.chat_display.count() == 0:
-                return
-                
-            # Get the history save path from config
-            save_folder = config.CHAT_HISTORY_SAVE_FOLDER
-            # Ensure the folder exists
-            os.makedirs(save_folder, exist_ok=True)
-            
-            # Create history filename
-            history_path = os.path.join(save_folder, "chat_history.json")
-            
-            # Create a list to store chat items
-            chat_history = []
-            
-            # Iterate through all items in chat display
-            for i in range(self.chat_display.count()):
-                item = self.chat_display.item(i)
-                widget = self.chat_display.itemWidget(item)
-                
-                # Check if it's a transcription item
-                if hasattr(widget, 'getText') and callable(widget.getText):
-                    # It's a transcription item
-                    chat_item = {
-                        'type': 'transcription',
-                        'timestamp': widget.timestamp if hasattr(widget, 'timestamp') else '',
-                        'text': widget.getText(),
-                        'audio_path': widget.audio_path if hasattr(widget, 'audio_path') else None
-                    }
-                    chat_history.append(chat_item)
-                    
-                # Check if it's an AI response
-                elif isinstance(widget, QWidget) and widget.layout():
-                    # Look for a QLabel in the widget's layout
-                    for j in range(widget.layout().count()):
-                        child = widget.layout().itemAt(j).widget()
-                        if isinstance(child, QLabel):
-                            # Found an AI response label
-                            chat_item = {
-                                'type': 'ai_response',
-                                'text': child.text()
-                            }
-                            chat_history.append(chat_item)
-                            break
+            chat_history = [dict(entry) for entry in self._chat_log]
+            self._io_pool.start(ChatHistoryWriter(self._chat_history_path(), chat_history, self._history_last_written))
             
-            # Save to file
-            with open(history_path, 'w', encoding='utf-8') as f:
-                json.dump(chat_history, f, ensure_ascii=False, indent=2)
-                
             # Log status if verbose
             if config.VERBOSE_OUTPUT:
                 self.log_status(f"Saved {len(chat_history)} chat messages to history")
@@ -1191,6 +1109,12 @@ class VoiceCommanderApp(QMainWindow):
         except Exception as e:
             self.log_status(f"Error saving chat history: {e}")
             logger.error(f"Error saving chat history: {e}", exc_info=True)
+    
+    def save_chat_history(self):
+        """Save the current chat history to disk immediately, flushing any pending save"""
+        self._save_timer.stop()
+        self._do_save_chat_history()
+        self._io_pool.waitForDone()
         
     def copy_to_clipboard(self, text):
         """Copy the given text to clipboard"""
@@ -1200,6 +1124,16 @@ class VoiceCommanderApp(QMainWindow):
         except Exception as e:
             self.log_status(f"Error copying to clipboard: {e}")
             
+    @pyqtSlot(str)
+    def _on_play_requested(self, audio_path):
+        """Handle a play request from a transcription item"""
+        self.play_audio(audio_path, self.sender())
+    
+    @pyqtSlot(str)
+    def _on_transcribe_requested(self, audio_path):
+        """Handle a re-transcribe request from a transcription item"""
+        self.retranscribe_audio(audio_path, self.sender())
+    
     def play_audio(self, audio_path, item_widget):
         """Play or stop the audio file at the given path"""
         # If the item is already playing, stop it and exit
@@ -1216,43 +1150,65 @@ class VoiceCommanderApp(QMainWindow):
             return
             
         try:
-            # Use pygame mixer to play the audio file
-            sound = pygame.mixer.Sound(audio_path)
+            # Use pygame mixer to play the audio file, reusing a recently decoded sound
+            cached = self._sound_cache.get(audio_path)
+            if cached is None:
+                sound = pygame.mixer.Sound(audio_path)
+                size = decoded_sound_size(sound)
+                self._sound_cache[audio_path] = (sound, size)
+                self._sound_cache_bytes += size
+            else:
+                sound = cached[0]
+            self._sound_cache.move_to_end(audio_path)
+            # Evict least recently played sounds until the cache fits its byte budget
+            # (a clip larger than the whole budget is dropped too; the widget keeps it while playing)
+            while self._sound_cache_bytes > SOUND_CACHE_BYTES:
+                _, (_, evicted_size) = self._sound_cache.popitem(last=False)
+                self._sound_cache_bytes -= evicted_size
             
             # Play the sound
-            sound.play()
+            channel = sound.play()
             
             # Store the sound in the widget
             item_widget.sound = sound
             item_widget.setPlaying(True)
+            self._playing_widgets.add(item_widget)
                 
-            # Schedule a check to see when the sound finishes playing
-            def check_if_still_playing():
-                if not pygame.mixer.get_busy() and item_widget.is_playing:
-                    item_widget.setPlaying(False)
-                    item_widget.sound = None
-            
-            # Check every 100ms if the sound is still playing
-            timer = QTimer(self)
-            timer.timeout.connect(check_if_still_playing)
-            timer.start(100)
+            # Watch the playback channel until the sound finishes
+            self._active_playback = (channel, item_widget)
+            self._playback_timer.start()
                 
             self.log_status(f"Playing audio: {os.path.basename(audio_path)}")
         except Exception as e:
             self.log_status(f"Error playing audio: {e}")
     
+    def _check_playback_finished(self):
+        """Reset the playing item once its playback channel goes idle"""
+        if self._active_playback is not None:
+            channel, item_widget = self._active_playback
+            if channel is not None and channel.get_busy():
+                return
+            if item_widget.is_playing:
+                item_widget.setPlaying(False)
+                item_widget.sound = None
+            self._playing_widgets.discard(item_widget)
+            self._active_playback = None
+        self._playback_timer.stop()
+    
     def stop_all_playback(self):
         """Stop all currently playing audio"""
-        # Stop all pygame channels
-        pygame.mixer.stop()
-        
-        # Reset all item widgets that might be in playing state
-        for i in range(self.chat_display.count()):
-            item = self.chat_display.item(i)
-            widget = self.chat_display.itemWidget(item)
-            if hasattr(widget, 'is_playing') and widget.is_playing:
+        # Stop all pygame channels (the mixer isn't initialized yet when the chat history first loads)
+        if pygame.mixer.get_init():
+            pygame.mixer.stop()
+        self._playback_timer.stop()
+        self._active_playback = None
+        
+        # Reset the item widgets that were put in playing state
+        for widget in self._playing_widgets:
+            if widget.is_playing:
                 widget.setPlaying(False)
                 widget.sound = None
+        self._playing_widgets.clear()
     
     def retranscribe_audio(self, audio_path, item_widget):
         """Re-transcribe the audio file at the given path"""
@@ -1260,41 +1216,50 @@ class VoiceCommanderApp(QMainWindow):
             self.log_status(f"Error: Audio file not found at {audio_path}")
             return
             
-        try:
-            # Read the audio file
-            with wave.open(audio_path, 'rb') as wf:
-                # Get the audio data
-                audio_data = wf.readframes(wf.getnframes())
+        # Run the transcription on a worker thread; the result comes back through signals
+        item_widget.transcribe_button.setEnabled(False)
+        job = RetranscribeRunnable(self.transcription_service.groq_whisper_service, audio_path, item_widget)
+        job.signals.done.connect(self._on_retranscribe_done)
+        job.signals.failed.connect(self._on_retranscribe_failed)
+        self._retranscribe_signals.add(job.signals)
+        QThreadPool.globalInstance().start(job)
+        
+    @pyqtSlot(object, object)
+    def _on_retranscribe_done(self, item_widget, new_text):
+        """Apply a finished re-transcription to its chat item"""
+        self._retranscribe_signals.discard(self.sender())
+        
+        # Skip items that were removed (e.g. new chat) while the request was in flight
+        list_item = self._item_by_widget.get(item_widget)
+        if list_item is None:
+            return
+        item_widget.transcribe_button.setEnabled(True)
+        
+        if new_text:
+            # Update the widget with the new transcription
+            item_widget.updateText(new_text)
+            entry = self._chat_entry_by_widget.get(item_widget)
+            if entry is not None:
+                entry['text'] = new_text
             
-            # Use the transcription service to re-transcribe
-            new_text = self.transcription_service.groq_whisper_service.TranscribeAudio(audio_data)
+            # Adjust the size of the list item to fit the new text
+            list_item.setSizeHint(item_widget.sizeHint())
             
-            if new_text:
-                # Update the widget with the new transcription
-                item_widget.updateText(new_text)
-                
-                # Adjust the size of the list item to fit the new text
-                # Find the list item that contains this widget
-                for i in range(self.chat_display.count()):
-                    list_item = self.chat_display.item(i)
-                    if self.chat_display.itemWidget(list_item) == item_widget:
-                        # Update the item hint based on the widget's recalculated hint
-                        list_item.setSizeHint(item_widget.sizeHint())
-                        break
-                
-                self.log_status(f"Re-transcribed audio: {new_text}")
-            else:
-                self.log_status("Transcription failed")
-        except Exception as e:
-            self.log_status(f"Error re-transcribing audio: {e}")
+            self.log_status(f"Re-transcribed audio: {new_text}")
+        else:
+            self.log_status("Transcription failed")
+            
+    @pyqtSlot(object, str)
+    def _on_retranscribe_failed(self, item_widget, error_msg):
+        """Report a failed re-transcription"""
+        self._retranscribe_signals.discard(self.sender())
+        if item_widget in self._item_by_widget:
+            item_widget.transcribe_button.setEnabled(True)
+        self.log_status(f"Error re-transcribing audio: {error_msg}")
 
 def main():
     """Main entry point for the Qt application"""
-    # Enable high DPI scaling
-    if hasattr(Qt, 'AA_EnableHighDpiScaling'):
-        QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
-    if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
-        QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
+    # High DPI scaling and pixmaps are always enabled in Qt 6, so no attributes need setting
     
     print("Voice Commander Qt v0.3.0\n")
     print("Starting the Qt-based Voice Commander application...")
@@ -1311,11 +1276,14 @@ def main():
     if not config.VERBOSE_OUTPUT:
         logging.getLogger('httpx').setLevel(logging.WARNING)
     
-    app = QApplication(sys.argv)
+    # Reuse an existing application instance if the app is launched from a host process
+    app = QApplication.instance() or QApplication(sys.argv)
+    
+    # Load the settings once; the window shares this instance
+    settings_manager = SettingsManager.SettingsManager()
     
     # If device is specified on command line, update settings before creating the app
     if args.device is not None:
-        settings_manager = SettingsManager.SettingsManager()
         try:
             # Try to convert to integer if it's a number
             device_index = int(args.device)
@@ -1326,10 +1294,9 @@ def main():
             settings_manager.set('microphone_name', args.device)
             print(f"Using command line specified device name: {args.device}")
     
-    window = VoiceCommanderApp()
+    window = VoiceCommanderApp(settings_manager)
     
     # Restore window position and size if available
-    settings_manager = SettingsManager.SettingsManager()
     position = settings_manager.get('window_position')
     size = settings_manager.get('window_size')
     
@@ -0,0 +1,122 @@
+import json
+import logging
+import mmap
+import os
+import wave
+from PyQt6.QtCore import QObject, QRunnable, pyqtSignal
+
+# orjson is optional; it encodes the chat history much faster than the stdlib json module
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger('VoiceCommander')
+
+def encode_chat_history(chat_history):
+    """Serialize the chat history to UTF-8 JSON bytes (indented by 2 spaces)"""
+    if orjson is not None:
+        return orjson.dumps(chat_history, option=orjson.OPT_INDENT_2)
+    return json.dumps(chat_history, ensure_ascii=False, indent=2).encode('utf-8')
+
+def decode_chat_history(data):
+    """Parse chat history JSON bytes (raises json.JSONDecodeError on invalid data)"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+def transcribe_wav_file(groq_service, audio_path):
+    """
+    Transcribe a saved WAV file without copying its PCM data
+
+    The file is memory-mapped and the frames are handed to TranscribeAudio as a
+    memoryview over the mapping, so no bytes object of the whole clip is built.
+
+    Returns:
+        The transcribed text, or None if transcription failed
+    """
+    with open(audio_path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        # Let wave parse the header; afterwards the file is positioned at the start of the frames
+        with wave.open(f, 'rb') as wf:
+            start = f.tell()
+            end = start + wf.getnframes() * wf.getsampwidth() * wf.getnchannels()
+        with memoryview(mm)[start:end] as audio_data:
+            return groq_service.TranscribeAudio(audio_data)
+
+class ChatHistoryWriter(QRunnable):
+    """
+    Runnable that writes a snapshot of the chat log to disk
+
+    last_written is a dict owned by the caller, mapping each history path to the
+    hash of the bytes last written there, so unchanged snapshots can be skipped.
+    Writers sharing one last_written dict must run on a single-thread pool.
+    """
+    def __init__(self, history_path, chat_history, last_written):
+        super().__init__()
+        self.history_path = history_path
+        self.chat_history = chat_history
+        self.last_written = last_written
+
+    def run(self):
+        """Write the chat history file if its content changed"""
+        try:
+            data = encode_chat_history(self.chat_history)
+            data_hash = hash(data)
+            if self.last_written.get(self.history_path) == data_hash:
+                return
+
+            # Write to a temporary file and swap it in, so a crash never leaves a truncated history
+            tmp_path = self.history_path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, self.history_path)
+            self.last_written[self.history_path] = data_hash
+        except Exception as e:
+            logger.error(f"Error saving chat history: {e}", exc_info=True)
+
+class RetranscribeSignals(QObject):
+    """
+    Signals emitted by RetranscribeRunnable (delivered on the thread that created them)
+    """
+    done = pyqtSignal(object, object)  # (item_widget, new text or None)
+    failed = pyqtSignal(object, str)   # (item_widget, error message)
+
+class RetranscribeRunnable(QRunnable):
+    """
+    Runnable that re-transcribes a saved audio clip off the UI thread
+    """
+    def __init__(self, groq_service, audio_path, item_widget):
+        super().__init__()
+        self.groq_service = groq_service
+        self.audio_path = audio_path
+        self.item_widget = item_widget
+        self.signals = RetranscribeSignals()
+
+    def run(self):
+        """Transcribe the clip and report the result"""
+        try:
+            new_text = transcribe_wav_file(self.groq_service, self.audio_path)
+        except Exception as e:
+            self.signals.failed.emit(self.item_widget, str(e))
+            return
+        self.signals.done.emit(self.item_widget, new_text)
+
+class MicrophoneSwitchSignals(QObject):
+    """
+    Signals emitted by MicrophoneSwitchRunnable (delivered on the thread that created them)
+    """
+    finished = pyqtSignal(bool)  # True if the device was switched
+
+class MicrophoneSwitchRunnable(QRunnable):
+    """
+    Runnable that opens a new input device off the UI thread
+    """
+    def __init__(self, audio_service, device_index):
+        super().__init__()
+        self.audio_service = audio_service
+        self.device_index = device_index
+        self.signals = MicrophoneSwitchSignals()
+
+    def run(self):
+        """Switch the device and report whether it succeeded"""
+        self.signals.finished.emit(self.audio_service.switch_device(self.device_index))
@@ -1,11 +1,8 @@
-import os
 import logging
-import time
 from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QGroupBox, QLabel, 
                             QComboBox, QScrollArea, QPushButton, QGridLayout, QLineEdit, 
                             QWidget, QTextEdit)
-from PyQt6.QtCore import Qt, QTimer, QSize
-from PyQt6.QtGui import QIcon
+from PyQt6.QtCore import Qt, QTimer, QSignalBlocker, pyqtSignal
 
 # Import pynput for keyboard capture
 try:
@@ -15,10 +12,30 @@ except ImportError:
     logging.error("pynput library not found. Cannot capture keyboard shortcuts.")
 
 from .theme import ThemeManager
+from ..KeyboardService import MODIFIER_KEYS
+
+# Keys that clear a shortcut while recording
+CANCEL_KEYS = frozenset({pynput_keyboard.Key.esc, pynput_keyboard.Key.delete}) if pynput_keyboard else frozenset()
+
+# Modifier names in display order, with their labels
+MODIFIER_ORDER = (('ctrl', 'Ctrl'), ('alt', 'Alt'), ('shift', 'Shift'), ('cmd', 'Win'))
+
+def key_display_name(key):
+    """Get a display name for a pynput key (character keys first, then named keys)"""
+    char = getattr(key, 'char', None)
+    if char:
+        return char.upper()
+    name = getattr(key, 'name', None)
+    if name:
+        return name.replace('_', ' ').title()
+    return repr(key).replace('Key.', '').upper()
 
 class SettingsDialog(QDialog):
     """Dialog for application settings"""
     
+    # Emitted from the pynput listener thread with (action name, shortcut data or None)
+    shortcut_captured = pyqtSignal(str, object)
+    
     def __init__(self, parent=None, settings_manager=None, keyboard_service=None, audio_service=None, groq_service=None):
         super().__init__(parent)
         self.parent = parent
@@ -27,6 +44,16 @@ class SettingsDialog(QDialog):
         self.audio_service = audio_service
         self.groq_service = groq_service
         self.shortcut_buttons = {}
+        self._last_device_list = None  # Device list the microphone combo was last built from
+        self._recording = None  # State of the shortcut recording in progress, if any
+        
+        # Edits are collected and written to disk together once typing pauses
+        self._pending_settings = {}
+        self._unfamiliar_words_dirty = False
+        self._settings_save_timer = QTimer(self)
+        self._settings_save_timer.setSingleShot(True)
+        self._settings_save_timer.setInterval(400)
+        self._settings_save_timer.timeout.connect(self._flush_settings)
         
         # Get the theme from settings
         self.theme = self.settings_manager.get('ui_theme', 'light')
@@ -34,20 +61,20 @@ class SettingsDialog(QDialog):
         self.setWindowTitle("Settings")
         self.setMinimumWidth(600)
         
-        # Apply theme
-        self.setStyleSheet(ThemeManager.get_dialog_style(self.theme))
-        
-        # Setup UI components
+        # Setup UI components; the heavier sections are built on the next event loop
+        # tick so the dialog can be shown and painted right away
+        self._ui_complete = False
         self.setup_ui()
+        QTimer.singleShot(0, self._setup_ui_rest)
         
-        # Ensure theme is fully applied to all components
+        # Apply theme to all components
         self.apply_theme(self.theme)
         
-    def setup_ui(self):
-        """Set up the settings dialog UI"""
-        # Get theme colors
-        colors = ThemeManager.get_theme(self.theme)
+        # Captured shortcuts arrive from the pynput thread
+        self.shortcut_captured.connect(self._on_shortcut_captured)
         
+    def setup_ui(self):
+        """Set up the dialog frame: scroll area, theme selection and close button"""
         layout = QVBoxLayout(self)
         layout.setSpacing(15)
         
@@ -55,12 +82,14 @@ class SettingsDialog(QDialog):
         scroll_area = QScrollArea()
         scroll_area.setWidgetResizable(True)
         scroll_area.setFrameShape(QScrollArea.Shape.NoFrame)
+        self._scroll_area = scroll_area
         
         # Create a widget to contain all the settings
         self.scroll_content = QWidget()  # Store as instance variable so we can reference it later
-        self.scroll_content.setStyleSheet(f"background-color: {colors['bg_primary']};")
+        self.scroll_content.setObjectName("scrollContent")  # Styled by the dialog stylesheet
         scroll_layout = QVBoxLayout(self.scroll_content)
         scroll_layout.setSpacing(15)
+        self._scroll_layout = scroll_layout
         
         # UI Theme group
         theme_group = QGroupBox("UI Theme")
@@ -68,7 +97,6 @@ class SettingsDialog(QDialog):
         
         # Create label with explicit non-transparent background
         theme_label = QLabel("Theme:")
-        theme_label.setStyleSheet(f"background-color: {colors['bg_secondary']}; color: {colors['text_primary']}")
         theme_layout.addWidget(theme_label)
         
         self.theme_combo = QComboBox()
@@ -85,6 +113,29 @@ class SettingsDialog(QDialog):
         theme_group.setLayout(theme_layout)
         scroll_layout.addWidget(theme_group)
         
+        # Set the scroll content widget
+        scroll_area.setWidget(self.scroll_content)
+        layout.addWidget(scroll_area)
+        
+        # Close button
+        self.close_button = QPushButton("Close")
+        self.close_button.setProperty("state", "inactive")  # Styled by the dialog stylesheet
+        self.close_button.clicked.connect(self.accept)
+        
+        # Add button to a centered layout
+        button_layout = QHBoxLayout()
+        button_layout.addStretch(1)
+        button_layout.addWidget(self.close_button)
+        button_layout.addStretch(1)
+        layout.addLayout(button_layout)
+
+    def _setup_ui_rest(self):
+        """Build the API, microphone and shortcut sections (runs once, deferred from __init__)"""
+        if self._ui_complete:
+            return
+        self._ui_complete = True
+        scroll_layout = self._scroll_layout
+        
         # API Settings group
         api_group = QGroupBox("API Settings")
         api_layout = QGridLayout()
@@ -98,7 +149,7 @@ class SettingsDialog(QDialog):
         saved_api_key = self.settings_manager.get('groq_api_key', '')
         self.api_key_input.setText(saved_api_key)
         # Connect signal to save immediately
-        self.api_key_input.textChanged.connect(self.save_api_key)
+        self._bind_setting(self.api_key_input.textChanged, 'groq_api_key', 'api_key')
         api_layout.addWidget(self.api_key_input, 0, 1)
         
         # LLM Model
@@ -118,7 +169,7 @@ class SettingsDialog(QDialog):
         if model_index >= 0:
             self.llm_model_combo.setCurrentIndex(model_index)
         # Connect signal to save immediately
-        self.llm_model_combo.currentTextChanged.connect(self.save_llm_model)
+        self._bind_setting(self.llm_model_combo.currentTextChanged, 'llm_model', 'model')
         api_layout.addWidget(self.llm_model_combo, 1, 1)
         
         # Transcription Model
@@ -137,7 +188,7 @@ class SettingsDialog(QDialog):
         if model_index >= 0:
             self.transcription_model_combo.setCurrentIndex(model_index)
         # Connect signal to save immediately
-        self.transcription_model_combo.currentTextChanged.connect(self.save_transcription_model)
+        self._bind_setting(self.transcription_model_combo.currentTextChanged, 'transcription_model', 'transcription_model')
         api_layout.addWidget(self.transcription_model_combo, 2, 1)
         
         # Unfamiliar Words
@@ -166,10 +217,9 @@ class SettingsDialog(QDialog):
         
         # Set current microphone from settings
         saved_mic_index = self.settings_manager.get('microphone_index', 0)
-        for i in range(self.microphone_combo.count()):
-            if self.microphone_combo.itemData(i) == saved_mic_index:
-                self.microphone_combo.setCurrentIndex(i)
-                break
+        row = self._mic_row.get(saved_mic_index)
+        if row is not None:
+            self.microphone_combo.setCurrentIndex(row)
                 
         # Connect signal to update immediately
         self.microphone_combo.currentIndexChanged.connect(self.microphone_changed)
@@ -194,7 +244,6 @@ class SettingsDialog(QDialog):
         for row, (action_name, display_name) in enumerate(shortcut_actions):
             # Create label with non-transparent background
             label = QLabel(display_name)
-            label.setStyleSheet(f"background-color: {colors['bg_secondary']}; color: {colors['text_primary']};")
             shortcuts_layout.addWidget(label, row, 0)
             
             # Get the display string for the shortcut
@@ -205,8 +254,8 @@ class SettingsDialog(QDialog):
             shortcut_btn.setToolTip("Click to set a new shortcut key (Escape/Delete to clear)")
             shortcut_btn.setMinimumWidth(120)
             
-            # Set button style
-            shortcut_btn.setStyleSheet(ThemeManager.get_inactive_button_style(self.theme))
+            # Styled by the dialog stylesheet
+            shortcut_btn.setProperty("state", "inactive")
             
             # Connect button to shortcut recording with the action name
             shortcut_btn.clicked.connect(lambda checked, action=action_name: self.start_shortcut_recording(action))
@@ -220,25 +269,23 @@ class SettingsDialog(QDialog):
         shortcuts_group.setLayout(shortcuts_layout)
         scroll_layout.addWidget(shortcuts_group)
         
-        # Set the scroll content widget
-        scroll_area.setWidget(self.scroll_content)
-        layout.addWidget(scroll_area)
-        
-        # Close button
-        self.close_button = QPushButton("Close")
-        self.close_button.setStyleSheet(ThemeManager.get_inactive_button_style(self.theme))
-        self.close_button.clicked.connect(self.accept)
-        
-        # Add button to a centered layout
-        button_layout = QHBoxLayout()
-        button_layout.addStretch(1)
-        button_layout.addWidget(self.close_button)
-        button_layout.addStretch(1)
-        layout.addLayout(button_layout)
+        # Grow the dialog to fit the new sections. Widgets added to an already
+        # visible parent are only shown later, so show them before measuring.
+        # QScrollArea only reads its content's size hint in setWidget, so measure
+        # the content itself, capped at the 24 text lines QScrollArea would ask for.
+        for group in (api_group, mic_group, shortcuts_group):
+            group.show()
+        self.scroll_content.adjustSize()
+        content_height = min(self.scroll_content.height(), 24 * self._scroll_area.fontMetrics().height())
+        grow = content_height - self._scroll_area.viewport().height()
+        if grow > 0:
+            self.resize(self.width(), self.height() + grow)
     
     def theme_changed(self, index):
         """Handle theme change"""
         theme_name = "dark" if index == 1 else "light"
+        if theme_name == self.theme:
+            return  # Nothing to restyle
         
         # Save to settings
         self.settings_manager.set('ui_theme', theme_name)
@@ -254,34 +301,51 @@ class SettingsDialog(QDialog):
             # Delay the main window theme change slightly to avoid UI flickering
             QTimer.singleShot(100, lambda: self.parent.change_theme(theme_name))
     
-    def save_api_key(self, text):
-        """Save API key to settings"""
-        self.settings_manager.set('groq_api_key', text)
-        # If groq_service is available, update it directly
-        if hasattr(self, 'groq_service') and self.groq_service:
-            self.groq_service.api_key = text
-    
-    def save_llm_model(self, model_name):
-        """Save LLM model to settings"""
-        self.settings_manager.set('llm_model', model_name)
-        # If groq_service is available, update it directly
-        if hasattr(self, 'groq_service') and self.groq_service:
-            self.groq_service.model = model_name
-    
-    def save_transcription_model(self, model_name):
-        """Save transcription model to settings"""
-        self.settings_manager.set('transcription_model', model_name)
-        # If groq_service is available, update it directly
-        if hasattr(self, 'groq_service') and self.groq_service:
-            self.groq_service.transcription_model = model_name
+    def _bind_setting(self, signal, settings_key, service_attr):
+        """
+        Save a widget's value to settings whenever it changes, and push it to the
+        groq_service attribute of the same meaning if a service was given
+        """
+        groq_service = self.groq_service
+        if groq_service:
+            def on_changed(value):
+                self._queue_setting(settings_key, value)
+                setattr(groq_service, service_attr, value)
+        else:
+            def on_changed(value):
+                self._queue_setting(settings_key, value)
+        signal.connect(on_changed)
     
     def save_unfamiliar_words(self):
-        """Save unfamiliar words to settings"""
-        text = self.unfamiliar_words.toPlainText()
-        self.settings_manager.set('unfamiliar_words', text)
-        # If groq_service is available, update it directly
-        if hasattr(self, 'groq_service') and self.groq_service:
-            self.groq_service.unfamiliar_words = text
+        """Save unfamiliar words to settings (the text is read when the settings are flushed)"""
+        self._unfamiliar_words_dirty = True
+        self._settings_save_timer.start()
+
+    def _queue_setting(self, key, value):
+        """Remember a changed setting; it is written with the next flush"""
+        self._pending_settings[key] = value
+        self._settings_save_timer.start()
+
+    def _flush_settings(self):
+        """Write all pending settings to disk in one go"""
+        self._settings_save_timer.stop()
+        if self._unfamiliar_words_dirty:
+            self._unfamiliar_words_dirty = False
+            text = self.unfamiliar_words.toPlainText()
+            self._pending_settings['unfamiliar_words'] = text
+            # If groq_service is available, update it directly
+            if self.groq_service:
+                self.groq_service.unfamiliar_words = text
+        if self._pending_settings:
+            pending, self._pending_settings = self._pending_settings, {}
+            self.settings_manager.update(pending)
+
+    def done(self, result):
+        """Flush pending settings and end any shortcut recording before the dialog closes"""
+        self._flush_settings()
+        if self._recording is not None:
+            self._finish_shortcut_recording(restore_text=True)
+        super().done(result)
 
     def log_error_message(self, message):
         """Log an error message to console"""
@@ -296,24 +360,40 @@ class SettingsDialog(QDialog):
     def microphone_changed(self, index):
         """Handle microphone selection change"""
         if index >= 0:
-            mic_index = self.microphone_combo.itemData(index)
-            mic_name = self.microphone_combo.itemText(index)
-            self.settings_manager.set('microphone_index', mic_index)
-            self.settings_manager.set('microphone_name', mic_name)
+            self._queue_setting('microphone_index', self.microphone_combo.itemData(index))
+            self._queue_setting('microphone_name', self.microphone_combo.itemText(index))
     
     def populate_microphones(self):
-        """Populate the microphone selection dropdown"""
-        self.microphone_combo.clear()
+        """Populate the microphone selection dropdown (skipped if the device list is unchanged)"""
+        device_list = tuple(self.audio_service.device_list)
+        if device_list == self._last_device_list:
+            return
+        self._last_device_list = device_list
         
-        # Add all available microphones
-        for device_id, device_name in self.audio_service.device_list:
-            self.microphone_combo.addItem(f"{device_name}", device_id)
+        # Rebuild without emitting selection changes, then restore the selected device
+        selected_mic_index = self.microphone_combo.currentData()
+        with QSignalBlocker(self.microphone_combo):
+            self.microphone_combo.clear()
+            
+            # Add all available microphones
+            for device_id, device_name in device_list:
+                self.microphone_combo.addItem(f"{device_name}", device_id)
+            # Map device id -> combo row, so lookups don't walk the combo
+            self._mic_row = {device_id: row for row, (device_id, _) in enumerate(device_list)}
+            
+            row = self._mic_row.get(selected_mic_index)
+            if row is not None:
+                self.microphone_combo.setCurrentIndex(row)
     
     def start_shortcut_recording(self, action_name):
         """Start recording a new keyboard shortcut for the given action using pynput"""
         if action_name not in self.shortcut_buttons:
             return
             
+        # Only one recording at a time
+        if self._recording is not None:
+            self._finish_shortcut_recording(restore_text=True)
+            
         button = self.shortcut_buttons[action_name]
         
         # Change button text to indicate recording state
@@ -329,288 +409,102 @@ class SettingsDialog(QDialog):
             self.log_error_message("pynput library not found. Cannot capture keyboard shortcuts.")
             return
 
-        # Temporarily stop keyboard service listener while capturing
-        try:
-            keyboard_service_active = False
-            if hasattr(self.keyboard_service, '_pynput_listener') and self.keyboard_service._pynput_listener:
-                self.keyboard_service.stop_listening()
-                keyboard_service_active = True
-                logging.debug("Temporarily stopped keyboard service listener for shortcut recording")
-        except Exception as e:
-            logging.error(f"Error stopping keyboard service listener: {e}")
-        
-        # Variables for capturing state
-        is_captured = False
-        captured_modifiers = set()
-        captured_key = None
-        captured_vk = None
-        display_string = ""
-
-        # Create a global variable to store key maps
-        _CANCEL_KEYS = {pynput_keyboard.Key.esc, pynput_keyboard.Key.delete}
-        
-        # Callbacks for the temporary listener
-        def on_press(key):
-            nonlocal is_captured, captured_modifiers, captured_key, captured_vk, display_string
-            
-            if is_captured:
-                return False  # Stop listener after capturing a key
-            
-            # Check for modifier keys
-            modifier = None
-            if key in (pynput_keyboard.Key.ctrl_l, pynput_keyboard.Key.ctrl_r):
-                modifier = 'ctrl'
-            elif key in (pynput_keyboard.Key.alt_l, pynput_keyboard.Key.alt_r, pynput_keyboard.Key.alt_gr):
-                modifier = 'alt'
-            elif key in (pynput_keyboard.Key.shift_l, pynput_keyboard.Key.shift_r):
-                modifier = 'shift'
-            elif key in (pynput_keyboard.Key.cmd_l, pynput_keyboard.Key.cmd_r, pynput_keyboard.Key.cmd):
-                modifier = 'cmd'
-                
-            if modifier:
-                captured_modifiers.add(modifier)
-                return True  # Continue listening for the actual key
-            
-            # Check if it's a cancel key
-            if key in _CANCEL_KEYS:
-                # Clear the shortcut
-                is_captured = True
-                captured_key = None
-                captured_vk = None
-                display_string = "None"
-                
-                # Update on UI thread
-                self.keyboard_service.set_shortcut_data(action_name, None)
-                return False
+        recording = {'action_name': action_name, 'original_text': original_text, 'listener': None}
+        self._recording = recording
+        
+        # Reuse the keyboard service's running listener; only start a temporary
+        # listener if the service isn't listening
+        if not self.keyboard_service.capture_next_key(
+                lambda key, modifiers: self._on_shortcut_key(action_name, key, modifiers)):
+            captured_modifiers = set()
             
-            # Otherwise it's the main key of the shortcut
-            is_captured = True
-            captured_key = key
-            
-            # Try to get the virtual key code
-            try:
-                captured_vk = getattr(key, 'vk', None)
-            except Exception:
-                captured_vk = None
+            # Callback for the temporary listener (runs on the pynput thread)
+            def on_press(key):
+                modifier = MODIFIER_KEYS.get(key)
+                if modifier:
+                    captured_modifiers.add(modifier)
+                    return True  # Continue listening for the actual key
+                self._on_shortcut_key(action_name, key, captured_modifiers)
+                return False  # Stop the listener after capturing a key
             
-            # Create a display string
-            parts = []
-            if 'ctrl' in captured_modifiers:
-                parts.append("Ctrl")
-            if 'alt' in captured_modifiers:
-                parts.append("Alt")
-            if 'shift' in captured_modifiers:
-                parts.append("Shift")
-            if 'cmd' in captured_modifiers:
-                parts.append("Win")
-            
-            try:
-                # Try to get a display name for the key
-                if hasattr(key, 'char') and key.char:
-                    key_name = key.char.upper()
-                elif hasattr(key, 'name') and key.name:
-                    key_name = key.name.replace('_', ' ').title()
-                else:
-                    key_name = str(key).replace('Key.', '').upper()
-                
-                parts.append(key_name)
-                display_string = '+'.join(parts)
-            except Exception as e:
-                logging.error(f"Error creating display string: {e}")
-                display_string = '+'.join(parts) + "+" + str(key)
-            
-            # Stop the listener
-            return False
-        
-        # Create a temporary listener
-        listener = pynput_keyboard.Listener(on_press=on_press)
-        listener.start()
-        
-        # Add a timeout to reset the button if no key is pressed
-        def reset_button():
-            if not is_captured and button.text() == "Press any key...":
-                button.setText(original_text)
-                button.setStyleSheet("")
-                try:
-                    listener.stop()
-                except:
-                    pass
-                finally:
-                    # Restart keyboard service listener
-                    if keyboard_service_active:
-                        self.keyboard_service.start_listening()
-        
-        # Schedule the reset after 5 seconds
-        QTimer.singleShot(5000, reset_button)
-        
-        # Wait for the listener to finish (up to 5 seconds)
-        listener.join(timeout=5.0)
-        
-        # Process the captured shortcut
-        if is_captured:
-            if captured_key:
-                # Create shortcut data for KeyboardService
-                shortcut_data = {
-                    'mods': captured_modifiers,
-                    'vk': captured_vk,
-                    'key_repr': str(captured_key),
-                    'display': display_string
-                }
-                
-                # Update the shortcut in the service
-                self.keyboard_service.set_shortcut_data(action_name, shortcut_data)
-                
-                # Update button display
-                button.setText(display_string)
-            else:
-                # Clear the shortcut (cancel keys were pressed)
-                button.setText("None")
+            recording['listener'] = pynput_keyboard.Listener(on_press=on_press)
+            recording['listener'].start()
+        
+        # Reset the button if no key is pressed within 5 seconds
+        QTimer.singleShot(5000, lambda: self._on_shortcut_recording_timeout(recording))
+
+    def _on_shortcut_key(self, action_name, key, modifiers):
+        """
+        Turn a key captured on the pynput thread into shortcut data and hand it to the
+        UI thread through shortcut_captured
+        """
+        # Cancel keys clear the shortcut
+        if key in CANCEL_KEYS:
+            self.shortcut_captured.emit(action_name, None)
+            return
+        
+        # Create a display string
+        parts = [label for modifier, label in MODIFIER_ORDER if modifier in modifiers]
+        parts.append(key_display_name(key))
+        
+        # Create shortcut data for KeyboardService
+        self.shortcut_captured.emit(action_name, {
+            'mods': set(modifiers),
+            'vk': getattr(key, 'vk', None),
+            'key_repr': str(key),
+            'display': '+'.join(parts)
+        })
+
+    def _on_shortcut_captured(self, action_name, shortcut_data):
+        """Apply a captured shortcut (None clears it) on the UI thread"""
+        if self._recording is None or self._recording['action_name'] != action_name:
+            return  # Recording already timed out or was replaced
             
-            # Reset button style
-            button.setStyleSheet("")
+        # Update the shortcut in the service
+        self.keyboard_service.set_shortcut_data(action_name, shortcut_data)
         
-        # Restart keyboard service listener if it was active
-        if keyboard_service_active:
-            self.keyboard_service.start_listening()
+        # Update button display
+        self.shortcut_buttons[action_name].setText(shortcut_data['display'] if shortcut_data else "None")
+        self._finish_shortcut_recording(restore_text=False)
+
+    def _on_shortcut_recording_timeout(self, recording):
+        """Give up on a recording that did not capture a key in time"""
+        if self._recording is recording:
+            self._finish_shortcut_recording(restore_text=True)
+
+    def _finish_shortcut_recording(self, restore_text):
+        """End the current shortcut recording"""
+        recording, self._recording = self._recording, None
+        button = self.shortcut_buttons[recording['action_name']]
+        if restore_text:
+            button.setText(recording['original_text'])
+        button.setStyleSheet("")  # Back to the dialog stylesheet
+        
+        if recording['listener'] is None:
+            self.keyboard_service.cancel_capture()
+            return
+        try:
+            recording['listener'].stop()
+        except Exception:
+            pass
 
     def get_selected_microphone(self):
         """Get the currently selected microphone index"""
+        self._setup_ui_rest()
         index = self.microphone_combo.currentIndex()
         if index >= 0:
             return self.microphone_combo.itemData(index)
         return None
 
+    def get_selected_microphone_name(self):
+        """Get the name of the currently selected microphone"""
+        self._setup_ui_rest()
+        return self.microphone_combo.currentText()
+
     def apply_theme(self, theme_name):
         """Apply theme to all components in the dialog"""
-        colors = ThemeManager.get_theme(theme_name)
-        
-        # Set the overall dialog style first
-        self.setStyleSheet(ThemeManager.get_dialog_style(theme_name))
-        
-        # Explicitly style the scroll content widget which holds all settings
-        self.scroll_content.setStyleSheet(f"background-color: {colors['bg_primary']};")
-        
-        # Explicitly style all major widget types
-        
-        # Update all labels
-        for label in self.findChildren(QLabel):
-            label.setStyleSheet(f"color: {colors['text_primary']}; background-color: {colors['bg_secondary']};")
-            
-        # Update all buttons
-        for btn in self.findChildren(QPushButton):
-            if btn in self.shortcut_buttons.values():
-                btn.setStyleSheet(ThemeManager.get_inactive_button_style(theme_name))
-            elif btn == self.close_button:
-                btn.setStyleSheet(ThemeManager.get_inactive_button_style(theme_name))
-                
-        # Update all group boxes
-        for group_box in self.findChildren(QGroupBox):
-            group_box.setStyleSheet(f"""
-                QGroupBox {{
-                    font-weight: bold;
-                    border: 1px solid {colors['border']};
-                    border-radius: 8px;
-                    margin-top: 12px;
-                    background-color: {colors['bg_secondary']};
-                }}
-                QGroupBox::title {{
-                    subcontrol-origin: margin;
-                    left: 10px;
-                    padding: 0 5px;
-                    color: {colors['text_primary']};
-                }}
-            """)
-            
-        # Update combo boxes
-        for combo in self.findChildren(QComboBox):
-            combo.setStyleSheet(f"""
-                QComboBox {{
-                    border: 1px solid {colors['border']};
-                    border-radius: 6px;
-                    padding: 5px;
-                    background-color: {colors['bg_secondary']};
-                    color: {colors['text_primary']};
-                }}
-                QComboBox::drop-down {{
-                    border: none;
-                    width: 24px;
-                }}
-                QComboBox QAbstractItemView {{
-                    background-color: {colors['bg_secondary']};
-                    border: 1px solid {colors['border']};
-                    border-radius: 6px;
-                    selection-background-color: {colors['bg_accent']};
-                    selection-color: {colors['text_primary']};
-                }}
-            """)
-            
-        # Update line edits
-        for line_edit in self.findChildren(QLineEdit):
-            line_edit.setStyleSheet(f"""
-                QLineEdit {{
-                    border: 1px solid {colors['border']};
-                    border-radius: 6px;
-                    padding: 8px;
-                    background-color: {colors['bg_secondary']};
-                    color: {colors['text_primary']};
-                }}
-                QLineEdit:focus {{
-                    border: 1px solid {colors['accent']};
-                }}
-            """)
-            
-        # Update text edits
-        for text_edit in self.findChildren(QTextEdit):
-            text_edit.setStyleSheet(f"""
-                QTextEdit {{
-                    border: 1px solid {colors['border']};
-                    border-radius: 6px;
-                    padding: 8px;
-                    background-color: {colors['bg_secondary']};
-                    color: {colors['text_primary']};
-                }}
-                QTextEdit:focus {{
-                    border: 1px solid {colors['accent']};
-                }}
-            """)
-        
-        # Update scroll areas
-        for scroll_area in self.findChildren(QScrollArea):
-            scroll_area.setStyleSheet(f"""
-                QScrollArea {{
-                    background-color: {colors['bg_primary']};
-                    border: none;
-                }}
-                QScrollBar:vertical {{
-                    border: none;
-                    background: {colors['scrollbar']};
-                    width: 8px;
-                    margin: 0px;
-                }}
-                QScrollBar::handle:vertical {{
-                    background: {colors['scrollbar_handle']};
-                    border-radius: 4px;
-                    min-height: 20px;
-                }}
-                QScrollBar::handle:vertical:hover {{
-                    background: {colors['scrollbar_handle_hover']};
-                }}
-                QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {{
-                    border: none;
-                    background: none;
-                    height: 0px;
-                }}
-            """)
-        
-        # Update general container widgets
-        for widget in self.findChildren(QWidget):
-            if (isinstance(widget, QWidget) and not any(isinstance(widget, t) for t in 
-                 [QLabel, QPushButton, QComboBox, QLineEdit, QTextEdit, QGroupBox, QScrollArea])):
-                if widget.layout() is not None:
-                    widget.setStyleSheet(f"background-color: {colors['bg_primary']};")
-        
-        # Force style update on all widgets
-        for widget in self.findChildren(QWidget):
-            widget.style().unpolish(widget)
-            widget.style().polish(widget)
-            widget.update() 
\ No newline at end of file
+        # Labels, group boxes, inputs, buttons and the scroll area are styled by the dialog stylesheet;
+        # skip re-setting an identical sheet, which would make Qt re-parse and re-polish everything
+        style = ThemeManager.get_dialog_style(theme_name)
+        if self.styleSheet() != style:
+            self.setStyleSheet(style)
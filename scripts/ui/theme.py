@@ -1,12 +1,12 @@
-from PyQt6.QtCore import Qt, QSize, QRect
-from PyQt6.QtGui import QIcon, QPixmap, QPainter, QColor
-import os
+from functools import lru_cache
+from types import MappingProxyType
 
 class ThemeManager:
     """Manages application themes and provides styling"""
     
+    # Theme colors are read-only, since the cached stylesheets are built from them
     # Light theme colors (Clean & Professional)
-    LIGHT_THEME = {
+    LIGHT_THEME = MappingProxyType({
         "bg_primary": "#ffffff",      # White
         "bg_secondary": "#ffffff",      # White (kept for compatibility, but ideally unused)
         "bg_accent": "#f0f0f0",       # Very light grey (hover/selection)
@@ -20,10 +20,10 @@ class ThemeManager:
         "scrollbar": "#f0f0f0",       # Light scrollbar
         "scrollbar_handle": "#bdbdbd", # Medium grey handle
         "scrollbar_handle_hover": "#a0a0a0" # Darker grey handle hover
-    }
+    })
     
     # Dark theme colors (Dark Cyan Tint)
-    DARK_THEME = {
+    DARK_THEME = MappingProxyType({
         "bg_primary": "#0a192f",      # Very dark navy/slate
         "bg_secondary": "#0a192f",      # Same as primary (kept for compatibility)
         "bg_accent": "#172a45",       # Slightly lighter shade (hover/selection)
@@ -37,16 +37,45 @@ class ThemeManager:
         "scrollbar": "#172a45",       # Darker scrollbar bg
         "scrollbar_handle": "#303C55", # Subtle handle
         "scrollbar_handle_hover": "#506680" # Lighter handle hover
+    })
+    
+    # Theme name -> colors mapping
+    THEMES = {"light": LIGHT_THEME, "dark": DARK_THEME}
+    
+    # Icon name -> simple Unicode character
+    ICON_CHARACTERS = {
+        "record-icon": "⏺",      # Simple record dot
+        "mic-icon": "🎙",        # Simple microphone
+        "ai-icon": "⚙",          # Simple gear/processing icon
+        "paste-icon": "📄",       # Simple document icon
+        "new-icon": "⟳",         # Simple refresh/reset icon
+        "settings-icon": "⚙",     # Simple gear icon
+        "play-icon": "▶",        # Simple triangle play icon
+        "stop-icon": "■",        # Simple square stop icon
+        "copy-icon": "📄",        # Simple document icon
+        "refresh-icon": "⟳",     # Simple refresh icon
+        # Default fallback icon
+        "default": "•"           # Simple dot as fallback
     }
     
     @classmethod
     def get_theme(cls, theme_name="light"):
-        """Get theme colors dictionary"""
-        return cls.DARK_THEME if theme_name.lower() == "dark" else cls.LIGHT_THEME
+        """Get the (read-only) theme colors mapping"""
+        colors = cls.THEMES.get(theme_name)
+        if colors is None:
+            # Unnormalized name: fall back to a case-insensitive match
+            colors = cls.DARK_THEME if theme_name.lower() == "dark" else cls.LIGHT_THEME
+        return colors
     
     @classmethod
+    @lru_cache(maxsize=8)
     def get_main_window_style(cls, theme):
-        """Get stylesheet for main window and base elements"""
+        """
+        Get stylesheet for main window and base elements (built once per theme)
+
+        Includes the main widget styles and the state button rules, so the window's
+        widgets are styled by this one sheet instead of one sheet per widget.
+        """
         colors = cls.get_theme(theme)
         # Simplified: Only set main window background, base font, default text color, scrollbars, splitter
         return f"""
@@ -103,17 +132,17 @@ class ThemeManager:
                 height: 1px; /* Make thinner */
                 width: 1px; /* Make thinner */
             }}
-            /* Styles for QGroupBox, QLabel, QComboBox, QListWidget, QTextEdit are now primarily handled in app.py apply_theme_to_all_widgets */
-        """
+        """ + "".join(cls.get_main_widget_styles(theme).values()) + cls.get_state_button_style(theme)
     
     @classmethod
-    def get_active_button_style(cls, theme):
+    @lru_cache(maxsize=16)
+    def get_active_button_style(cls, theme, selector="QPushButton"):
         """Get active button style"""
         colors = cls.get_theme(theme)
         # Define text color based on theme for contrast with accent
         text_color = "#ffffff" if theme == "light" else colors["bg_primary"] # White on light blue, Dark bg color on dark cyan
         return f"""
-            QPushButton {{
+            {selector} {{
                 min-width: 110px;
                 min-height: 24px;
                 max-height: 24px;
@@ -124,18 +153,16 @@ class ThemeManager:
                 color: {text_color};
                 font-weight: 600;
             }}
-            QPushButton:hover {{
+            {selector}:hover {{
                 /* Slightly darken/lighten accent for hover - simple approach */
                 background-color: {cls._adjust_color(colors["accent"], -20 if theme == 'light' else 20)};
                 border-color: {cls._adjust_color(colors["accent"], -20 if theme == 'light' else 20)};
             }}
-            QPushButton:pressed {{
+            {selector}:pressed {{
                 background-color: {cls._adjust_color(colors["accent"], -40 if theme == 'light' else 40)};
                 border-color: {cls._adjust_color(colors["accent"], -40 if theme == 'light' else 40)};
-                min-height: 24px; /* Keep size consistent */
-                max-height: 24px;
             }}
-            QPushButton:disabled {{
+            {selector}:disabled {{
                 background-color: {colors["bg_accent"]}; /* Use accent bg for disabled */
                 border-color: {colors["border"]};
                 color: {colors["text_secondary"]};
@@ -143,7 +170,8 @@ class ThemeManager:
         """
     
     @classmethod
-    def get_inactive_button_style(cls, theme):
+    @lru_cache(maxsize=16)
+    def get_inactive_button_style(cls, theme, selector="QPushButton"):
         """Get inactive button style"""
         colors = cls.get_theme(theme)
         # Use bg_accent for light inactive, a specific darker shade for dark inactive
@@ -152,7 +180,7 @@ class ThemeManager:
         inactive_pressed_bg = cls._adjust_color(inactive_bg, -20 if theme == 'light' else 20)
 
         return f"""
-            QPushButton {{
+            {selector} {{
                 min-width: 110px;
                 min-height: 24px;
                 max-height: 24px;
@@ -163,17 +191,15 @@ class ThemeManager:
                 color: {colors["text_primary"]};
                 font-weight: 600;
             }}
-            QPushButton:hover {{
+            {selector}:hover {{
                 background-color: {inactive_hover_bg};
                 border-color: {cls._adjust_color(colors["border"], 0 if theme == 'light' else 15)}; /* Slightly lighter border on dark hover */
             }}
-            QPushButton:pressed {{
+            {selector}:pressed {{
                 background-color: {inactive_pressed_bg};
                 border-color: {cls._adjust_color(colors["border"], 0 if theme == 'light' else 25)};
-                min-height: 24px; /* Keep size consistent */
-                max-height: 24px;
             }}
-            QPushButton:disabled {{
+            {selector}:disabled {{
                 background-color: {colors["bg_accent"]}; /* Use accent bg for disabled */
                 border-color: {colors["border"]};
                 color: {colors["text_secondary"]};
@@ -182,6 +208,14 @@ class ThemeManager:
         """
     
     @classmethod
+    @lru_cache(maxsize=8)
+    def get_state_button_style(cls, theme):
+        """Get a combined button style switched by the dynamic "state" property ("active"/"inactive")"""
+        return (cls.get_active_button_style(theme, selector='QPushButton[state="active"]') +
+                cls.get_inactive_button_style(theme, selector='QPushButton[state="inactive"]'))
+    
+    @classmethod
+    @lru_cache(maxsize=8)
     def get_small_button_style(cls, theme):
         """Get style for small buttons"""
         colors = cls.get_theme(theme)
@@ -211,8 +245,6 @@ class ThemeManager:
             QPushButton:pressed {{
                 background-color: {small_pressed_bg};
                 border-color: {cls._adjust_color(colors["border"], 0 if theme == 'light' else 25)}; /* Match inactive button pressed */
-                min-height: 24px; /* Keep reduced size consistent */
-                max-height: 24px;
             }}
             QPushButton:disabled {{
                 background-color: {cls._adjust_color(small_button_bg, -5 if theme == 'light' else 5)}; /* Slightly adjusted bg */
@@ -223,49 +255,240 @@ class ThemeManager:
         """
     
     @classmethod
+    @lru_cache(maxsize=16)
+    def get_playing_button_style(cls, theme, selector="QPushButton"):
+        """Get style for a small button whose audio is playing (accent colored)"""
+        colors = cls.get_theme(theme)
+        text_color = "#ffffff" if theme == "light" else colors["bg_primary"] # Contrast text
+        return f"""
+            {selector} {{
+                background-color: {colors["accent"]};
+                border: 1px solid {colors["accent"]};
+                color: {text_color};
+                border-radius: 4px;
+                padding: 1px; /* Match reduced padding */
+                min-height: 24px; /* Reduced size */
+                max-height: 24px;
+                min-width: 24px;
+                max-width: 24px;
+                font-size: 14pt; /* Larger icon size */
+            }}
+            {selector}:hover {{
+                 background-color: {cls._adjust_color(colors["accent"], -20 if theme == 'light' else 20)};
+                 border-color: {cls._adjust_color(colors["accent"], -20 if theme == 'light' else 20)};
+            }}
+            {selector}:pressed {{
+                 background-color: {cls._adjust_color(colors["accent"], -40 if theme == 'light' else 40)};
+                 border-color: {cls._adjust_color(colors["accent"], -40 if theme == 'light' else 40)};
+            }}
+        """
+    
+    @classmethod
+    @lru_cache(maxsize=8)
     def get_dialog_style(cls, theme):
-        """Get dialog style consistent with main theme"""
+        """Get dialog style consistent with main theme, including the state button rules (built once per theme)"""
         colors = cls.get_theme(theme)
-        # Define selection text color for contrast within dialog inputs
-        selection_text_color_input = "#ffffff" if theme == "light" else colors["bg_primary"] # White on light accent, Dark bg color on dark accent
 
         return f"""
             QDialog {{
                 background-color: {colors["bg_primary"]};
                 color: {colors["text_primary"]}; /* Ensure default text color */
             }}
-            /* Apply consistent GroupBox style */
-            /* QGroupBox styling removed as it's overridden in SettingsDialog.apply_theme */
-            /* Apply consistent LineEdit style */
-            /* QLineEdit styling removed as it's overridden in SettingsDialog.apply_theme */
-            /* Apply consistent TextEdit style */
-            /* QTextEdit styling removed as it's overridden in SettingsDialog.apply_theme */
-            /* Add default Label style for dialogs */
-            /* QLabel styling removed as it's overridden in SettingsDialog.apply_theme */
-            /* Style buttons within dialogs consistently */
-            /* QPushButton styling removed as it's overridden in SettingsDialog.apply_theme */
-        """
-    
-    @classmethod
-    def get_transcription_item_styles(cls, theme):
-        """Get styles for transcription list items"""
-        colors = cls.get_theme(theme)
-        # User bubble: Transparent background, no border, minimal padding
-        user_bubble_style = f"""
             QLabel {{
                 color: {colors["text_primary"]};
-                background-color: transparent; /* Transparent */
-                padding: 1px; /* Minimal padding */
-                border: none; /* No border */
-                /* border-radius removed */
-                font-size: 11pt;
-                font-family: 'Segoe UI', sans-serif;
-                margin: 2px; /* Keep slight margin */
+                background-color: {colors["bg_secondary"]};
+            }}
+            QGroupBox {{
+                font-weight: bold;
+                border: 1px solid {colors["border"]};
+                border-radius: 8px;
+                margin-top: 12px;
+                background-color: {colors["bg_secondary"]};
             }}
+            QGroupBox::title {{
+                subcontrol-origin: margin;
+                left: 10px;
+                padding: 0 5px;
+                color: {colors["text_primary"]};
+            }}
+            QComboBox {{
+                border: 1px solid {colors["border"]};
+                border-radius: 6px;
+                padding: 5px;
+                background-color: {colors["bg_secondary"]};
+                color: {colors["text_primary"]};
+            }}
+            QComboBox::drop-down {{
+                border: none;
+                width: 24px;
+            }}
+            QComboBox QAbstractItemView {{
+                background-color: {colors["bg_secondary"]};
+                border: 1px solid {colors["border"]};
+                border-radius: 6px;
+                selection-background-color: {colors["bg_accent"]};
+                selection-color: {colors["text_primary"]};
+            }}
+            QLineEdit {{
+                border: 1px solid {colors["border"]};
+                border-radius: 6px;
+                padding: 8px;
+                background-color: {colors["bg_secondary"]};
+                color: {colors["text_primary"]};
+            }}
+            QLineEdit:focus {{
+                border: 1px solid {colors["accent"]};
+            }}
+            QTextEdit {{
+                border: 1px solid {colors["border"]};
+                border-radius: 6px;
+                padding: 8px;
+                background-color: {colors["bg_secondary"]};
+                color: {colors["text_primary"]};
+            }}
+            QTextEdit:focus {{
+                border: 1px solid {colors["accent"]};
+            }}
+            QScrollArea {{
+                background-color: {colors["bg_primary"]};
+                border: none;
+            }}
+            QWidget#scrollContent {{
+                background-color: {colors["bg_primary"]};
+            }}
+            QScrollArea QScrollBar:vertical {{
+                border: none;
+                background: {colors["scrollbar"]};
+                width: 8px;
+                margin: 0px;
+            }}
+            QScrollArea QScrollBar::handle:vertical {{
+                background: {colors["scrollbar_handle"]};
+                border-radius: 4px;
+                min-height: 20px;
+            }}
+            QScrollArea QScrollBar::handle:vertical:hover {{
+                background: {colors["scrollbar_handle_hover"]};
+            }}
+            QScrollArea QScrollBar::add-line:vertical, QScrollArea QScrollBar::sub-line:vertical {{
+                border: none;
+                background: none;
+                height: 0px;
+            }}
+        """ + cls.get_state_button_style(theme)
+    
+    @classmethod
+    @lru_cache(maxsize=8)
+    def get_main_widget_styles(cls, theme):
+        """Get the per-widget-type rules of the main window stylesheet (built once per theme, read-only)"""
+        colors = cls.get_theme(theme)
+        # Ensure selection colors contrast well
+        list_selection_text_color = colors["text_primary"] if theme == "light" else "#ffffff" # Dark text on light accent, White text on dark accent
+        log_selection_text_color = "#ffffff" if theme == "light" else colors["bg_primary"] # White on light accent, Dark bg color on dark accent
+        return MappingProxyType({
+            "container_style": f"""
+                QWidget#centralWidget, QWidget#controlsContainer {{
+                    background-color: {colors['bg_primary']};
+                }}
+            """,
+            "label_style": f"""
+                QLabel {{
+                    {cls.get_label_style(theme)}
+                }}
+            """,
+            "title_label_style": f"""
+                QLabel#titleLabel {{
+                    font-weight: bold;
+                    font-size: 16px;
+                    {cls.get_label_style(theme, is_transparent=True)}
+                }}
+            """,
+            "combo_style": f"""
+                QComboBox {{
+                    border: 1px solid {colors["border"]};
+                    border-radius: 6px;
+                    padding: 5px;
+                    background-color: {colors["bg_primary"]}; /* Use primary bg */
+                    color: {colors["text_primary"]};
+                }}
+                QComboBox::drop-down {{
+                    border: none;
+                    width: 24px;
+                    /* TODO: Consider styling the dropdown arrow based on theme */
+                }}
+                QComboBox QAbstractItemView {{
+                    background-color: {colors["bg_primary"]}; /* Use primary bg */
+                    border: 1px solid {colors["border"]};
+                    border-radius: 6px;
+                    selection-background-color: {colors["bg_accent"]};
+                    selection-color: {list_selection_text_color}; /* Ensure contrast */
+                }}
+            """,
+            "groupbox_style": f"""
+                QGroupBox {{
+                    font-weight: bold;
+                    border: 1px solid {colors["border"]};
+                    border-radius: 8px;
+                    margin-top: 12px;
+                    background-color: {colors["bg_primary"]}; /* Use primary bg */
+                }}
+                QGroupBox::title {{
+                    subcontrol-origin: margin;
+                    left: 10px;
+                    padding: 0 5px;
+                    color: {colors["text_primary"]};
+                    background-color: {colors["bg_primary"]}; /* Title bg matches GroupBox */
+                    border-radius: 4px; /* Optional: Slightly round title bg */
+                }}
+            """,
+            "status_style": f"""
+                QPlainTextEdit {{
+                    border: 1px solid {colors["border"]};
+                    border-radius: 8px;
+                    background-color: {colors["bg_primary"]}; /* Use primary bg */
+                    selection-background-color: {colors["accent"]};
+                    selection-color: {log_selection_text_color}; /* Ensure contrast */
+                    color: {colors["text_primary"]};
+                }}
+            """,
+            "chat_style": f"""
+                QListWidget {{
+                    border: 1px solid {colors["border"]};
+                    border-radius: 8px;
+                    background-color: {colors["bg_primary"]}; /* Use primary bg */
+                    alternate-background-color: {colors["bg_primary"]}; /* Use primary bg - remove alternation */
+                    padding: 2px;
+                }}
+                QListWidget::item {{
+                    padding: 0px;
+                    border-radius: 6px;
+                    color: {colors["text_primary"]}; /* Ensure item text color is set */
+                    background-color: transparent; /* Ensure item background is transparent by default */
+                }}
+                QListWidget::item:hover {{
+                    background-color: {colors["bg_accent"]}; /* Hover uses accent bg */
+                }}
+                QListWidget::item:selected {{
+                     background-color: {colors["accent"]}; /* Selection uses main accent */
+                     color: {list_selection_text_color}; /* Ensure contrast for selected text */
+                     border-radius: 6px;
+                }}
+            """,
+        })
+    
+    @classmethod
+    @lru_cache(maxsize=8)
+    def get_transcription_item_styles(cls, theme):
         """
-        # AI response: Transparent background, no border, minimal padding
-        ai_response_style = f"""
-            QLabel {{
+        Get the rules of the transcription list item stylesheet (built once per theme, read-only)
+
+        Each rule is scoped by object name or by the "playing" property, so the rules
+        can be combined into one sheet (see get_transcription_item_sheet).
+        """
+        colors = cls.get_theme(theme)
+        # User and AI bubbles share one style: transparent background, no border, minimal padding
+        bubble_style = f"""
+            QLabel#textLabel {{
                 color: {colors["text_primary"]};
                 background-color: transparent; /* Transparent */
                 padding: 1px; /* Minimal padding */
@@ -277,48 +500,45 @@ class ThemeManager:
             }}
         """
 
-        return {
-            "user_bubble_style": user_bubble_style,
-            "ai_response_style": ai_response_style,
-            "timestamp_style": f"color: {colors['text_secondary']}; font-size: 9pt;",
-            "container_style": f"background-color: {colors['bg_primary']}; border: none;", # Container for item widget should blend in
-            "button_style": cls.get_small_button_style(theme) # Use existing small style for consistency
-        }
+        return MappingProxyType({
+            "user_bubble_style": bubble_style,
+            "ai_response_style": bubble_style,
+            "timestamp_style": f"QLabel#timestampLabel {{ color: {colors['text_secondary']}; font-size: 9pt; }}",
+            # Container for item widget should blend in
+            "container_style": f"QWidget#transcriptionItem {{ background-color: {colors['bg_primary']}; border: none; }}",
+            "button_style": cls.get_small_button_style(theme), # Use existing small style for consistency
+            "playing_button_style": cls.get_playing_button_style(theme, selector='QPushButton[playing="true"]')
+        })
+        
+    @classmethod
+    @lru_cache(maxsize=8)
+    def get_transcription_item_sheet(cls, theme, is_ai=False):
+        """Get the complete stylesheet of a transcription list item (built once per theme and kind)"""
+        styles = cls.get_transcription_item_styles(theme)
+        return "".join((
+            styles["container_style"],
+            styles["timestamp_style"],
+            styles["ai_response_style"] if is_ai else styles["user_bubble_style"],
+            styles["button_style"],
+            styles["playing_button_style"],  # Last, so it wins over the plain button rules
+        ))
         
     @classmethod
     def get_icon_color(cls, theme):
         """Get the appropriate icon color for the current theme"""
-        return "#ffffff" if theme.lower() == "dark" else "#000000"
+        return "#ffffff" if cls.get_theme(theme) is cls.DARK_THEME else "#000000"
         
     @classmethod
+    @lru_cache(maxsize=32)
     def get_icon_character(cls, icon_name):
         """Get a simple Unicode character for the specified icon name"""
-        icon_map = {
-            "record-icon": "⏺",      # Simple record dot
-            "mic-icon": "🎙",        # Simple microphone
-            "ai-icon": "⚙",          # Simple gear/processing icon
-            "paste-icon": "📄",       # Simple document icon
-            "new-icon": "⟳",         # Simple refresh/reset icon
-            "settings-icon": "⚙",     # Simple gear icon
-            "play-icon": "▶",        # Simple triangle play icon
-            "stop-icon": "■",        # Simple square stop icon
-            "copy-icon": "📄",        # Simple document icon
-            "refresh-icon": "⟳",     # Simple refresh icon
-            # Default fallback icon
-            "default": "•"           # Simple dot as fallback
-        }
-        
-        # Extract base name without path and extension
-        if "/" in icon_name:
-            icon_name = icon_name.split("/")[-1]
-        if "." in icon_name:
-            icon_name = icon_name.split(".")[0]
-            
-        # Return the mapped character or default
-        return icon_map.get(icon_name, icon_map["default"])
+        # Extract base name without path and extension, then return the mapped character or default
+        icon_name = icon_name.rpartition("/")[2].partition(".")[0]
+        return cls.ICON_CHARACTERS.get(icon_name, cls.ICON_CHARACTERS["default"])
         
 
     @classmethod
+    @lru_cache(maxsize=8)
     def get_label_style(cls, theme, is_transparent=False):
         """Get default label style"""
         colors = cls.get_theme(theme)
@@ -328,12 +548,18 @@ class ThemeManager:
     # Helper method to adjust color brightness (simple version)
     # Might need a more robust implementation if complex adjustments are needed
     @classmethod
+    @lru_cache(maxsize=64)
     def _adjust_color(cls, hex_color, amount):
         """Lighten or darken a hex color"""
         try:
             hex_color = hex_color.lstrip('#')
-            rgb = tuple(int(hex_color[i:i+2], 16) for i in (0, 2, 4))
-            new_rgb = tuple(max(0, min(255, c + amount)) for c in rgb)
-            return f"#{new_rgb[0]:02x}{new_rgb[1]:02x}{new_rgb[2]:02x}"
-        except:
+            if len(hex_color) < 6:
+                return hex_color
+            # Parse once as a packed 0xRRGGBB value and adjust each channel
+            packed = int(hex_color[:6], 16)
+            r = max(0, min(255, (packed >> 16) + amount))
+            g = max(0, min(255, ((packed >> 8) & 0xff) + amount))
+            b = max(0, min(255, (packed & 0xff) + amount))
+            return "#%02x%02x%02x" % (r, g, b)
+        except (AttributeError, TypeError, ValueError):
             return hex_color # Return original if adjustment fails 
\ No newline at end of file
@@ -1,12 +1,19 @@
-from PyQt6.QtWidgets import QWidget, QHBoxLayout, QVBoxLayout, QLabel, QPushButton, QSizePolicy
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QIcon
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton, QSizePolicy
+from PyQt6.QtCore import Qt, pyqtSignal
 
 from .theme import ThemeManager
 
 class TranscriptionListItem(QWidget):
     """Custom widget for displaying a transcription item in the list"""
     
+    # Signals emitted by the item's buttons
+    copyRequested = pyqtSignal(str)        # Emitted with the current text
+    playRequested = pyqtSignal(str)        # Emitted with the audio path
+    transcribeRequested = pyqtSignal(str)  # Emitted with the audio path
+    
+    # Shared by every item's text label (setSizePolicy copies it)
+    _TEXT_LABEL_POLICY = QSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.MinimumExpanding)
+    
     def __init__(self, parent=None, theme="dark", is_ai=False):
         super().__init__(parent)
         self.audio_path = None
@@ -14,14 +21,15 @@ class TranscriptionListItem(QWidget):
         self.sound = None
         self.theme = theme
         self.is_ai = is_ai
+        self._cached_hint = None
+        self._cached_hint_key = None
         self.setup_ui()
         
     def setup_ui(self):
         """Set up the UI components for this widget"""
-        # Get theme styles
-        styles = ThemeManager.get_transcription_item_styles(self.theme)
-        # Set container background
-        self.setStyleSheet(styles["container_style"])
+        # One stylesheet on the item styles it and all of its children by object name
+        self.setObjectName("transcriptionItem")
+        self.setStyleSheet(ThemeManager.get_transcription_item_sheet(self.theme, self.is_ai))
         
         # Main layout - horizontal with gradient background
         main_layout = QHBoxLayout(self)
@@ -31,18 +39,17 @@ class TranscriptionListItem(QWidget):
         
         # Timestamp label with better styling
         self.timestamp_label = QLabel()
-        self.timestamp_label.setStyleSheet(styles["timestamp_style"])
+        self.timestamp_label.setObjectName("timestampLabel")
         self.timestamp_label.setFixedWidth(80)
         main_layout.addWidget(self.timestamp_label)
         
         # Text content - expand horizontally using user bubble style
         self.text_label = QLabel()
+        self.text_label.setObjectName("textLabel")
         self.text_label.setWordWrap(True)
-        bubble_style = styles["ai_response_style"] if self.is_ai else styles["user_bubble_style"]
-        self.text_label.setStyleSheet(bubble_style)
         self.text_label.setMinimumHeight(16)
         # Set size policy to encourage vertical expansion for wrapped text
-        self.text_label.setSizePolicy(QSizePolicy(QSizePolicy.Policy.Preferred, QSizePolicy.Policy.MinimumExpanding))
+        self.text_label.setSizePolicy(self._TEXT_LABEL_POLICY)
         main_layout.addWidget(self.text_label, 1)  # Add stretch factor of 1 to expand
         
         # Button container
@@ -55,7 +62,7 @@ class TranscriptionListItem(QWidget):
         self.copy_button.setText("📄")  # Simple document icon
         self.copy_button.setToolTip("Copy transcription to clipboard")
         self.copy_button.setFixedSize(24, 24)  # Reduced size
-        self.copy_button.setStyleSheet(styles["button_style"]) # Style already updated by Jill's change
+        self.copy_button.clicked.connect(self._on_copy_clicked)
         button_layout.addWidget(self.copy_button)
         
         # Play button with simple Unicode icon
@@ -63,8 +70,9 @@ class TranscriptionListItem(QWidget):
         self.play_button.setText("▶")  # Simple triangle play icon
         self.play_button.setToolTip("Play audio")
         self.play_button.setFixedSize(24, 24)  # Reduced size
-        self.play_button.setStyleSheet(styles["button_style"]) # Style already updated by Jill's change
+        self.play_button.setProperty("playing", False)  # Switches to the accent style while playing
         self.play_button.setEnabled(False)  # Disabled by default until audio_path is set
+        self.play_button.clicked.connect(self._on_play_clicked)
         button_layout.addWidget(self.play_button)
         
         # Transcribe Again button with simple Unicode icon
@@ -72,8 +80,8 @@ class TranscriptionListItem(QWidget):
         self.transcribe_button.setText("⟳")  # Simple refresh icon
         self.transcribe_button.setToolTip("Transcribe again")
         self.transcribe_button.setFixedSize(24, 24)  # Reduced size
-        self.transcribe_button.setStyleSheet(styles["button_style"]) # Style already updated by Jill's change
         self.transcribe_button.setEnabled(False)  # Disabled by default until audio_path is set
+        self.transcribe_button.clicked.connect(self._on_transcribe_clicked)
         button_layout.addWidget(self.transcribe_button)
         
         main_layout.addLayout(button_layout)
@@ -87,11 +95,26 @@ class TranscriptionListItem(QWidget):
         self.text_label.setText(text)
         self.audio_path = audio_path
         self.timestamp = timestamp
+        self._invalidate_size_hint()
         
         # Enable/disable buttons based on audio path availability
         self.play_button.setEnabled(audio_path is not None)
         self.transcribe_button.setEnabled(audio_path is not None)
         
+    def _on_copy_clicked(self):
+        """Request copying the current text"""
+        self.copyRequested.emit(self.getText())
+        
+    def _on_play_clicked(self):
+        """Request playing (or stopping) this item's audio"""
+        if self.audio_path:
+            self.playRequested.emit(self.audio_path)
+            
+    def _on_transcribe_clicked(self):
+        """Request re-transcribing this item's audio"""
+        if self.audio_path:
+            self.transcribeRequested.emit(self.audio_path)
+        
     def getText(self):
         """Get the current text"""
         return self.text_label.text()
@@ -99,68 +122,47 @@ class TranscriptionListItem(QWidget):
     def updateText(self, new_text):
         """Update the displayed text"""
         self.text_label.setText(new_text)
+        self._invalidate_size_hint()
+        
+    def sizeHint(self):
+        """Get the size hint, cached per (text, width) so the layout isn't re-run on every query"""
+        key = (self.text_label.text(), self.width())
+        if self._cached_hint is None or self._cached_hint_key != key:
+            self._cached_hint = super().sizeHint()
+            self._cached_hint_key = key
+        return self._cached_hint
+        
+    def _invalidate_size_hint(self):
+        """Drop the cached size hint after a content or style change"""
+        self._cached_hint = None
+        self.updateGeometry()
         
     def setTheme(self, theme):
-        """Update the widget with the current theme"""
+        """Update the widget with the current theme (no-op if it already uses it)"""
+        if theme == self.theme:
+            return
         self.theme = theme
-        styles = ThemeManager.get_transcription_item_styles(theme)
-        colors = ThemeManager.get_theme(theme)
-
-        # Update container background
-        self.setStyleSheet(styles["container_style"])
-
-        # Update timestamp and text bubble
-        self.timestamp_label.setStyleSheet(styles["timestamp_style"])
-        bubble_style = styles["ai_response_style"] if self.is_ai else styles["user_bubble_style"]
-        self.text_label.setStyleSheet(bubble_style)
-
-        # Update buttons (inactive state)
-        inactive_style = styles["button_style"]
-        self.copy_button.setStyleSheet(inactive_style)
-        self.transcribe_button.setStyleSheet(inactive_style)
-
-        # Update play/stop button based on current state
-        self.setPlaying(self.is_playing)
+        # Qt doesn't propagate a second stylesheet change to children that were never
+        # polished, so polish first (a no-op once the item has been shown)
+        self.ensurePolished()
+        self.setStyleSheet(ThemeManager.get_transcription_item_sheet(theme, self.is_ai))
+        self._invalidate_size_hint()
 
     def setPlaying(self, is_playing):
-        """Update the play button state and style"""
+        """Update the play button state and style (no-op if the state is unchanged)"""
+        if is_playing == self.is_playing:
+            return
         self.is_playing = is_playing
-        styles = ThemeManager.get_transcription_item_styles(self.theme)
-        colors = ThemeManager.get_theme(self.theme)
-
         if is_playing:
-            # Define active style using accent color
-            text_color = "#ffffff" if self.theme == "light" else colors["bg_primary"] # Contrast text
-            active_style = f"""
-                QPushButton {{
-                    background-color: {colors["accent"]};
-                    border: 1px solid {colors["accent"]};
-                    color: {text_color};
-                    border-radius: 4px;
-                    padding: 1px; /* Match reduced padding */
-                    min-height: 24px; /* Reduced size */
-                    max-height: 24px;
-                    min-width: 24px;
-                    max-width: 24px;
-                    font-size: 14pt; /* Larger icon size */
-                }}
-                QPushButton:hover {{
-                     background-color: {ThemeManager._adjust_color(colors["accent"], -20 if self.theme == 'light' else 20)};
-                     border-color: {ThemeManager._adjust_color(colors["accent"], -20 if self.theme == 'light' else 20)};
-                }}
-                QPushButton:pressed {{
-                     background-color: {ThemeManager._adjust_color(colors["accent"], -40 if self.theme == 'light' else 40)};
-                     border-color: {ThemeManager._adjust_color(colors["accent"], -40 if self.theme == 'light' else 40)};
-                }}
-            """
             self.play_button.setText("■")  # Simple square stop icon
             self.play_button.setToolTip("Stop playback")
-            self.play_button.setStyleSheet(active_style)
         else:
-            # Revert to standard small button style (already includes larger font size from Jill's change)
             self.play_button.setText("▶")  # Simple triangle play icon
             self.play_button.setToolTip("Play audio")
-            self.play_button.setStyleSheet(styles["button_style"]) # Uses updated small button style from ThemeManager
+        # Re-polish so the item stylesheet's [playing="true"] rules are re-evaluated
+        self.play_button.setProperty("playing", is_playing)
+        self.play_button.style().unpolish(self.play_button)
+        self.play_button.style().polish(self.play_button)
         
     def stopPlayback(self):
         """Stop any active playback"""
@@ -3,14 +3,8 @@
 Voice Commander - A voice-controlled assistant with Qt UI
 """
 
-import sys
-import os
-
-# Add the current directory to the path so we can import our modules
-sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-
-# Import from scripts
+# Running this file puts its directory first on sys.path, so the scripts package is importable as is
 from scripts.main import main
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    main()